@@ -0,0 +1,193 @@
+import pygame
+import os
+import io
+import json
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from startupTrace import startup_trace
+
+ATLAS_INDEX = "./assets/Atlas/atlas.json"  # Written by tools/build_atlas.py, sprites are decoded one by one without it
+LOADER_THREADS = 4  # Worker threads decoding images for preloads
+
+def read_image(path):
+    """Read and decode an image without converting it, which is safe away from the main thread."""
+    with open(path, "rb") as f:
+        data = f.read()
+    return pygame.image.load(io.BytesIO(data), path)  # The path tells SDL the file type
+
+# Sheets a scene will need, decoded on worker threads. Call update every frame so the main thread
+# converts the finished ones into the cache, a few at a time.
+class Preload:
+    def __init__(self, manager, keys):
+        self.manager = manager
+        self.remaining = list(keys)  # load_frames arguments not in the cache yet
+        self.total = len(self.remaining)
+
+    @property
+    def done(self):
+        return not self.remaining
+
+    @property
+    def progress(self):
+        """Fraction of the sheets that are ready, from 0 to 1."""
+        return 1 - len(self.remaining) / self.total if self.total else 1.0
+
+    def update(self, budget_ms=4):
+        """Convert sheets that have finished decoding until budget_ms has been spent."""
+        start = time.perf_counter()
+        for key in list(self.remaining):
+            if (time.perf_counter() - start) * 1000 >= budget_ms:
+                break
+            if self.manager.decoded(key):
+                self.manager.load_frames(*key)
+                self.remaining.remove(key)
+
+    def wait(self):
+        """Finish everything now, waiting for the workers if they're still going."""
+        for key in self.remaining:
+            self.manager.load_frames(*key)
+        self.remaining = []
+
+# Shared asset cache so every enemy, trap, fruit and character reuses the same decoded surfaces
+class AssetManager:
+    def __init__(self, max_bytes=64 * 1024 * 1024, atlas_index=ATLAS_INDEX):
+        self.max_bytes = max_bytes  # Memory budget for cached surfaces before old entries get evicted
+        self.__cache = OrderedDict()  # Key -> (frames, size in bytes), oldest first
+        self.__bytes = 0
+        self.atlas_index = atlas_index
+        self.__atlas = None  # Key -> [(page, rect)] for every packed frame, loaded the first time a sprite is needed
+        self.__pages = []  # Atlas images, converted to the display format
+        self.__atlas_bytes = 0  # Memory held by the pages, counted once however many frames are cut from them
+        self.__atlas_frames = {}  # Key -> frames cut from the atlas. Never evicted, they'd free nothing while the pages are loaded
+        self.atlas_hits = 0  # Sprites cut from the atlas instead of decoded from their own file
+        self.__decoding = {}  # Key -> future of the decoded sheet, for sheets being preloaded
+        self.__workers = None  # Thread pool, started by the first preload
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def load_image(self, image_path, scale=1, pixel_format="alpha"):
+        """Load a single image, scaled by the given factor, from the cache or from disk."""
+        return self.load_frames(image_path, None, None, scale, pixel_format)[0]
+
+    def load_frames(self, sheet_path, frame_width, frame_height, scale=2, pixel_format="alpha"):
+        """Slice a sprite sheet into scaled frames. A frame size of None keeps the whole image as one frame."""
+        key = (sheet_path, frame_width, frame_height, scale, pixel_format)
+        entry = self.__cache.get(key)
+        if entry is not None:
+            self.hits += 1
+            self.__cache.move_to_end(key)  # Mark as most recently used
+            return entry[0]
+        frames = self.__atlas_frames.get(key)
+        if frames is not None:
+            self.hits += 1
+            return frames
+
+        self.misses += 1
+        with startup_trace.span("asset", sheet_path):
+            packed = self.__get_atlas().get(key)  # The first lookup loads the atlas
+            if packed is not None:
+                self.atlas_hits += 1
+                frames = self.__atlas_frames[key] = tuple(self.__pages[page].subsurface(rect) for page, rect in packed)
+                return frames
+            frames = self.__decode(sheet_path, frame_width, frame_height, scale, pixel_format, self.__decoding.pop(key, None))
+        size = sum(self.__surface_bytes(frame) for frame in frames)
+        self.__cache[key] = (frames, size)
+        self.__bytes += size
+        self.__evict()
+        return frames
+
+    def __decode(self, sheet_path, frame_width, frame_height, scale, pixel_format, decoding=None):
+        """Read the image from disk, or take it from a preload, convert it to the display format and cut it into frames."""
+        sheet = decoding.result() if decoding is not None else pygame.image.load(sheet_path)
+        if pixel_format == "alpha":
+            sheet = sheet.convert_alpha()
+        elif pixel_format == "opaque":
+            sheet = sheet.convert()
+
+        frame_width = frame_width or sheet.get_width()
+        frame_height = frame_height or sheet.get_height()
+        frames = []
+        for y in range(sheet.get_height() // frame_height):  # Loop through rows
+            for x in range(sheet.get_width() // frame_width):  # Loop through columns
+                frame = sheet.subsurface(pygame.Rect(x * frame_width, y * frame_height, frame_width, frame_height))
+                if scale != 1:
+                    frame = pygame.transform.scale(frame, (frame_width * scale, frame_height * scale))
+                else:
+                    frame = frame.copy()  # Don't keep the whole sheet alive through a subsurface
+                frames.append(frame)
+        return tuple(frames)  # Tuples so callers can't change the shared frames
+
+    def preload(self, keys):
+        """Start decoding sheets on worker threads and return a Preload that finishes them. Keys are load_frames arguments."""
+        atlas = self.__get_atlas()
+        keys = [key for key in dict.fromkeys(keys) if key not in self.__cache and key not in self.__atlas_frames]
+        for key in keys:
+            if key not in self.__decoding and key not in atlas:  # Sprites in the atlas only need cutting out
+                if self.__workers is None:
+                    self.__workers = ThreadPoolExecutor(LOADER_THREADS, thread_name_prefix="assets")
+                self.__decoding[key] = self.__workers.submit(read_image, key[0])
+        return Preload(self, keys)
+
+    def decoded(self, key):
+        """True if loading key won't have to wait for a worker."""
+        decoding = self.__decoding.get(key)
+        return decoding is None or decoding.done()
+
+    def __get_atlas(self):
+        """Load the atlas index and pages the first time they're needed, or nothing if the atlas hasn't been built."""
+        if self.__atlas is None:
+            self.__atlas = {}
+            if self.atlas_index and os.path.isfile(self.atlas_index):
+                self.load_atlas(self.atlas_index)
+        return self.__atlas
+
+    def load_atlas(self, index_path):
+        """Cut sprites from the atlas described by index_path from now on."""
+        with open(index_path) as f:
+            index = json.load(f)
+        directory = os.path.dirname(index_path)
+        self.__pages = [pygame.image.load(os.path.join(directory, page)).convert_alpha() for page in index["pages"]]
+        self.__atlas_bytes = sum(self.__surface_bytes(page) for page in self.__pages)
+        self.__atlas_frames.clear()
+        self.__evict()
+        self.__atlas = {
+            (sprite["path"], sprite["frame_width"], sprite["frame_height"], sprite["scale"], "alpha"):
+                [(page, pygame.Rect(rect)) for page, *rect in sprite["frames"]]
+            for sprite in index["sprites"]
+        }
+
+    def cached(self):
+        """(key, frames) for every cached entry, oldest first, e.g. for packing them into an atlas."""
+        return list(self.__atlas_frames.items()) + [(key, frames) for key, (frames, _) in self.__cache.items()]
+
+    def __surface_bytes(self, surface):
+        return surface.get_width() * surface.get_height() * surface.get_bytesize()
+
+    def __evict(self):
+        """Drop the least recently used decoded entries until they and the atlas pages fit in the memory budget."""
+        while self.__bytes + self.__atlas_bytes > self.max_bytes and len(self.__cache) > 1:
+            _, (_, size) = self.__cache.popitem(last=False)
+            self.__bytes -= size
+            self.evictions += 1
+
+    def stats(self):
+        """Return the cache counters for debugging and benchmarks."""
+        return {
+            "entries": len(self.__cache) + len(self.__atlas_frames),
+            "bytes": self.__bytes + self.__atlas_bytes,
+            "atlas_bytes": self.__atlas_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "atlas_hits": self.atlas_hits,
+        }
+
+    def clear(self):
+        self.__cache.clear()
+        self.__atlas_frames.clear()
+        self.__bytes = 0
+
+# One manager for the whole process
+assets = AssetManager()
@@ -0,0 +1,54 @@
+# Times one collision step with many enemies and traps, the grid broad phase against checking every pair
+# Run from the repository root: python benchmarks/bench_collisions.py [--json results.json]
+import argparse
+import random
+import harness  # Sets up the dummy drivers and the import path
+import pygame
+from variables import WIDTH
+from collisionWorld import CollisionWorld, PLAYER, ENEMY, TRAP, FRUIT, LAVA
+
+COUNTS = (10, 100, 500)
+
+class Thing:
+    """Anything with a rect, standing in for an enemy or trap."""
+    def __init__(self, rect):
+        self.rect = rect
+
+def build(count):
+    """A player plus count enemies and traps spread over three screens."""
+    player = Thing(pygame.Rect(WIDTH // 2, 300, 64, 64))
+    things = [(Thing(pygame.Rect(random.randint(0, WIDTH * 3), random.randint(100, 450), 64, 64)), random.choice([ENEMY, TRAP]))
+              for _ in range(count)]
+    return player, things
+
+def every_pair(bodies):
+    """Compare every body with every other, what the broad phase avoids."""
+    contacts = []
+    for i, (a, a_layer, a_mask) in enumerate(bodies):
+        for b, b_layer, b_mask in bodies[i + 1:]:
+            if (a_mask & b_layer or b_mask & a_layer) and a.rect.colliderect(b.rect):
+                contacts.append((a, b))
+    return contacts
+
+def main():
+    parser = argparse.ArgumentParser(description="Time the collision broad phase against checking every pair")
+    parser.add_argument("--repeat", type=int, default=200, help="timed steps per benchmark")
+    parser.add_argument("--json", help="file to save the results to")
+    args = parser.parse_args()
+
+    random.seed(0)
+    results = {}
+    for count in COUNTS:
+        player, things = build(count)
+        world = CollisionWorld()
+        world.add(player, PLAYER, ENEMY | TRAP | FRUIT | LAVA)
+        bodies = [(player, PLAYER, ENEMY | TRAP | FRUIT | LAVA)]
+        for thing, layer in things:
+            world.add(thing, layer)
+            bodies.append((thing, layer, 0))
+        results[f"every_pair[{count}]"] = harness.measure(lambda: every_pair(bodies), repeat=args.repeat)
+        results[f"grid[{count}]"] = harness.measure(world.step, repeat=args.repeat)
+    harness.report(results, args.json)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+# Times one update of many enemies, each updating itself against all of them moving in the NumPy store
+# Run from the repository root: python benchmarks/bench_enemy_store.py [--json results.json]
+import argparse
+import random
+import harness  # Sets up the dummy drivers and the import path
+import pygame
+from variables import WIDTH, HEIGHT
+import entityStore
+
+COUNTS = (10, 100, 500)
+
+def spawn(count):
+    """Spawn count enemies of every kind, spread over the screen."""
+    from enemies import enemy_land, enemy_air
+    kinds = enemy_land + enemy_air
+    return [kinds[i % len(kinds)].spawn(random.randint(-WIDTH, 0)) for i in range(count)]
+
+def main():
+    parser = argparse.ArgumentParser(description="Time enemy updates with and without the NumPy entity store")
+    parser.add_argument("--repeat", type=int, default=200, help="timed updates per benchmark")
+    parser.add_argument("--json", help="file to save the results to")
+    args = parser.parse_args()
+    pygame.init()
+    pygame.display.set_mode((WIDTH, HEIGHT))
+    random.seed(0)
+    results = {}
+    for count in COUNTS:
+        enemies = spawn(count)
+        def update_each():
+            for enemy in enemies:
+                enemy.update(0)
+        results[f"objects[{count}]"] = harness.measure(update_each, repeat=args.repeat)
+
+        store = entityStore.EnemyStore(seed=0)
+        for enemy in spawn(count):
+            store.add(enemy)
+        results[f"store[{count}]"] = harness.measure(lambda: store.update(0), repeat=args.repeat)
+    harness.report(results, args.json)
+    pygame.quit()
+
+if __name__ == "__main__":
+    main()
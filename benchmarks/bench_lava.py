@@ -0,0 +1,79 @@
+# Times one frame of lava drawing: scaling every tile, blitting every tile, and blitting only the visible ones at once.
+# Also times a lava collision check scanning every tile against searching the tiles sorted by x.
+# Run from the repository root: python benchmarks/bench_lava.py
+import time
+import harness  # Sets up the dummy drivers and the import path
+import pygame
+import numpy as np
+from variables import WIDTH, HEIGHT, TERRAIN
+from lava import Lava
+
+FRAMES = 300
+CHECKS = 20000
+
+def tiles(lava):
+    return zip(lava.tile_x.tolist(), lava.tile_y.tolist(), lava.tile_size.tolist())
+
+def draw_scaling_every_tile(lava, screen, camera_x):
+    """The first Lava.draw, which scaled the frame again for every tile."""
+    frame = lava.frames[lava.current_frame]
+    for x, y, tile_size in tiles(lava):
+        scaled_frame = pygame.transform.scale(frame, (tile_size, tile_size))
+        screen.blit(scaled_frame, (x - camera_x, y))
+
+def draw_every_tile(lava, screen, camera_x):
+    """The Lava.draw before culling, one blit per tile whether it's on the screen or not."""
+    scaled = lava.get_scaled_frames(lava.current_frame)
+    for x, y, tile_size in tiles(lava):
+        screen.blit(scaled[tile_size], (x - camera_x, y))
+
+def collides_scanning_every_tile(lava, rect, hit_width, hit_height):
+    """The Lava.collides before the x index came back, testing every tile."""
+    return bool(np.any(
+        (lava.tile_x < rect.right) & (lava.tile_x + hit_width > rect.left)
+        & (lava.tile_y < rect.bottom) & (lava.tile_y + hit_height > rect.top)
+    ))
+
+def time_collides(collides, rects):
+    """Average microseconds per check, for a player sized rect at spots across the screen."""
+    start = time.perf_counter()
+    for i in range(CHECKS):
+        collides(rects[i % len(rects)], 4, 4)
+    return (time.perf_counter() - start) * 1_000_000 / CHECKS
+
+def time_draw(lava, screen, draw):
+    """Average milliseconds per frame over every animation frame of the lava."""
+    start = time.perf_counter()
+    for i in range(FRAMES):
+        lava.current_frame = i % len(lava.frames)
+        draw(screen, 0)
+    return (time.perf_counter() - start) * 1000 / FRAMES
+
+def main():
+    pygame.init()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    lava = Lava(frames_directory="./assets/Lava", terrain_height=TERRAIN)
+
+    # Warm up the cache so the first pass through the animation isn't counted
+    for i in range(len(lava.frames)):
+        lava.get_scaled_frames(i)
+
+    scaling = time_draw(lava, screen, lambda screen, camera_x: draw_scaling_every_tile(lava, screen, camera_x))
+    every = time_draw(lava, screen, lambda screen, camera_x: draw_every_tile(lava, screen, camera_x))
+    visible = time_draw(lava, screen, lava.draw)
+    print(f"Lava tiles: {len(lava.tile_x)}, on screen: {len(lava.visible_tiles(0))}, animation frames: {len(lava.frames)}")
+    print(f"Scaling every tile:        {scaling:.3f} ms per frame")
+    print(f"Pre-scaled, every tile:    {every:.3f} ms per frame")
+    print(f"Pre-scaled, visible tiles: {visible:.3f} ms per frame")
+    print(f"Speed up: {scaling / visible:.1f}x over scaling, {every / visible:.1f}x over every tile")
+
+    rects = [pygame.Rect(x, HEIGHT - TERRAIN - 60, 40, 60) for x in range(-100, WIDTH, 37)]
+    assert all(lava.collides(rect, 4, 4) == collides_scanning_every_tile(lava, rect, 4, 4) for rect in rects)
+    scanning = time_collides(lambda rect, w, h: collides_scanning_every_tile(lava, rect, w, h), rects)
+    indexed = time_collides(lava.collides, rects)
+    print(f"Collision, every tile:     {scanning:.2f} us per check")
+    print(f"Collision, sorted by x:    {indexed:.2f} us per check ({scanning / indexed:.1f}x)")
+    pygame.quit()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+# Times the hot paths of a game frame one at a time
+# Run from the repository root: python benchmarks/bench_subsystems.py [--json results.json]
+import argparse
+from harness import make_play, measure, report
+
+def character_state(player, damage_timer=0, immunity=False, speed_cooldown=False, facing_left=False):
+    """Put the character into one of its tint states before timing its draw."""
+    player.damage_timer = damage_timer
+    player.immunity = immunity
+    player.speed_cooldown = speed_cooldown
+    player.facing_left = facing_left
+
+def build_cases(play):
+    """Return benchmark name -> function to time."""
+    from enemies import Chicken, Bunny, Bee, generate_random_enemy
+    from traps import generate_random_trap
+    from objectPool import pools
+    from variables import HEIGHT
+
+    screen = play.screen
+    terrain_height = HEIGHT - play.terrain_image.get_height()
+    player = play.player
+    chicken = Chicken(play.camera_x + 600, HEIGHT - 128)
+    bunny = Bunny(play.camera_x + 600, HEIGHT - 149)
+    bee = Bee(play.camera_x + 600, 200)
+
+    def draw_character(**state):
+        def run():
+            character_state(player, **state)
+            player.draw(screen, (400, 300))
+        return run
+
+    def enemy_frame(enemy):
+        def run():
+            enemy.update(play.camera_x)
+            enemy.draw(screen, play.camera_x)
+        return run
+
+    def spawn_enemy():
+        for enemy in generate_random_enemy(play.camera_x):
+            pools.release(enemy)  # Straight back to the pool, so every call after the first reuses it
+
+    def spawn_trap():
+        pools.release(generate_random_trap())
+
+    def hud_changed():
+        play.score += 1  # Force the HUD to be rebuilt
+        play.hud.draw(screen, play.current_health, play.score)
+
+    return {
+        "lava.update": lambda: play.lava.update(play.camera_x),
+        "lava.draw": lambda: play.lava.draw(screen, play.camera_x),
+        "hud.draw[unchanged]": lambda: play.hud.draw(screen, play.current_health, play.score),
+        "hud.draw[changed]": hud_changed,
+        "play.draw_background": lambda: play.draw_background(play.camera_x),
+        "play.draw_terrain": lambda: play.draw_terrain(play.camera_x),
+        "character.draw[plain]": draw_character(),
+        "character.draw[facing_left]": draw_character(facing_left=True),
+        "character.draw[damage]": draw_character(damage_timer=20),
+        "character.draw[immunity]": draw_character(damage_timer=20, immunity=True),
+        "character.draw[speed]": draw_character(speed_cooldown=True),
+        "land_enemy.update+draw[Chicken]": enemy_frame(chicken),
+        "land_enemy.update+draw[Bunny]": enemy_frame(bunny),
+        "air_enemy.update+draw[Bee]": enemy_frame(bee),
+        "generate_random_enemy": spawn_enemy,
+        "generate_random_trap": spawn_trap,
+        "fruit.update": lambda: play.fruit_system.update(terrain_height, play.camera_x),
+        "fruit.draw": lambda: play.fruit_system.draw(screen, play.camera_x),
+        "play.handle_collisions": play.handle_collisions,
+        "play.update": play.update,
+        "play.draw": play.draw,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Time each part of a game frame")
+    parser.add_argument("--repeat", type=int, default=500, help="timed calls per benchmark")
+    parser.add_argument("--only", help="only run benchmarks whose name contains this text")
+    parser.add_argument("--json", help="file to save the results to")
+    args = parser.parse_args()
+
+    play = make_play()
+    # Run the game for a while so the camera, lava and fruit are in a typical state
+    for _ in range(120):
+        play.update()
+
+    results = {}
+    for name, func in build_cases(play).items():
+        if args.only and args.only not in name:
+            continue
+        results[name] = measure(func, repeat=args.repeat)
+    report(results, args.json)
+    print(f"Character frame table: {play.player.frame_table_bytes() / 1024:.0f} KB for {len(play.player.frame_table)} variants")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+# Shared setup and timing for the benchmarks, run them from the repository root
+import os
+import sys
+import json
+import time
+
+# Benchmarks always run without a window or sound
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+
+def make_play(seed=0):
+    """Create a headless game that holds right, ready for update and draw calls."""
+    import random
+    from game import Play, ScriptedInput
+    from gameMusic import Music
+    from variables import WIDTH, HEIGHT
+
+    random.seed(seed)
+    pygame.display.set_mode((WIDTH, HEIGHT))
+    return Play(Music(), headless=True, input_source=ScriptedInput())
+
+def measure(func, repeat=500, warmup=20):
+    """Call func repeatedly and return its timings in milliseconds."""
+    for _ in range(warmup):
+        func()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter_ns()
+        func()
+        timings.append((time.perf_counter_ns() - start) / 1_000_000)
+    return summarise(timings)
+
+def summarise(timings):
+    """Mean, p50 and p99 of a list of timings in milliseconds."""
+    ordered = sorted(timings)
+    return {
+        "runs": len(ordered),
+        "mean_ms": sum(ordered) / len(ordered),
+        "p50_ms": ordered[len(ordered) // 2],
+        "p99_ms": ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))],
+    }
+
+def report(results, json_path=None):
+    """Print a table of results and optionally save them as JSON so runs can be compared."""
+    width = max(len(name) for name in results)
+    print(f"{'benchmark'.ljust(width)}  {'mean ms':>9}  {'p50 ms':>9}  {'p99 ms':>9}")
+    for name, result in results.items():
+        print(f"{name.ljust(width)}  {result['mean_ms']:9.4f}  {result['p50_ms']:9.4f}  {result['p99_ms']:9.4f}")
+    if json_path:
+        with open(json_path, "w") as f:
+            json.dump({"pygame": pygame.version.ver, "python": sys.version.split()[0], "results": results}, f, indent=2)
+        print(f"Saved results to {json_path}")
@@ -1,5 +1,6 @@
 import pygame
 from variables import BUTTON_COLOR, FONT_SIZE, FONT_COLOR, BUTTON_HOVER_COLOR
+from fontRegistry import fonts
 
 class Button:
     def __init__(self, text, x, y, width, height, action):
@@ -10,7 +11,7 @@ class Button:
         self.text = text  # Button text
 
         # Set up font and render text
-        self.font = pygame.font.SysFont("JetBrains Mono", FONT_SIZE, bold=True)
+        self.font = fonts.get(FONT_SIZE, bold=True)
         self.text_surface = self.font.render(self.text, True, FONT_COLOR)
         self.text_rect = self.text_surface.get_rect(center=self.rect.center) # Center text
 
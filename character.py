@@ -1,10 +1,25 @@
 import pygame
 import os
 from variables import WIDTH, HEIGHT, FPS  # Import game settings (screen width, height, and FPS)
-from database import Database  # Import the Database class for fetching character data
+from assetManager import assets  # Shared cache so sprite sheets are only decoded once
+
+# Colours multiplied into the sprite for each effect (red for damage, green for immunity, blue for speed boost)
+TINTS = {
+    "damage": (255, 0, 0, 50),
+    "immunity": (0, 255, 0, 50),
+    "speed": (0, 0, 255, 50),
+}
+
+def character_paths(name):
+    """Sprite sheet for each action of the character in assets/MainCharacters."""
+    base_path = f"./assets/MainCharacters/{name}"
+    return {action: f"{base_path}/{action}.png" for action in ("idle", "run", "jump", "double_jump")}
 
 # Character class
 class Character:
+    sprite_size = 32  # Original sprite width and height (assumed size for character)
+    scale_factor = 2  # Scale the sprites to make them bigger
+
     def __init__(self,action_paths):
         # Load the sprite sheets for each action and store them in a dictionary
         self.sprites = {
@@ -12,6 +27,13 @@ class Character:
             for action, path in action_paths.items()  # Loop over all actions and paths
         }
 
+        # Ready-to-draw frames for each (action, facing left, tint). Mirrored frames are built now,
+        # tinted ones the first time that effect is shown, so drawing never makes a new surface
+        self.frame_table = {}
+        for action, sprites in self.sprites.items():
+            self.frame_table[(action, False, None)] = sprites
+            self.frame_table[(action, True, None)] = tuple(pygame.transform.flip(sprite, True, False) for sprite in sprites)
+
         # Initialize character's current action and animation frame
         self.current_action = "idle"  # Default action
         self.current_frame = 0  # Start with the first frame
@@ -26,52 +48,60 @@ class Character:
         self.immunity = False  # Immunity flag to show if character is invulnerable
         self.speed_cooldown = False  # Speed boost cooldown flag
 
+    @property
+    def rect(self):
+        """Hit box, the size of a frame at the character's position."""
+        return pygame.Rect(self.position[0], self.position[1], 64, 64)
+
+    @property
+    def image(self):
+        """The current frame, facing the right way with any effect applied."""
+        return self.__get_frames(self.current_action, self.facing_left, self.current_tint())[self.current_frame]
+
     def draw(self, screen, position):
         """Draw the character on the screen with any effects applied."""
-        # Get the current frame based on the action
-        frame = self.sprites[self.current_action][self.current_frame]
-        
-        # Flip the sprite horizontally if the character is facing left
-        if self.facing_left:
-            frame = pygame.transform.flip(frame, True, False)
-
-        # Apply effects based on timers (red for damage, green for immunity, blue for speed boost)
-        if self.damage_timer > 0:  
-            if self.immunity:  # Apply green tint effect when immune
-                green_tinted = frame.copy()
-                green_tinted.fill((0, 255, 0, 50), special_flags=pygame.BLEND_RGBA_MULT)
-                screen.blit(green_tinted, position)
-            else:  # Apply red tint effect when damaged
-                red_tinted = frame.copy()
-                red_tinted.fill((255, 0, 0, 50), special_flags=pygame.BLEND_RGBA_MULT)
-                screen.blit(red_tinted, position)
-        elif self.speed_cooldown:  # Apply blue tint effect when speed boost is active
-            blue_tinted = frame.copy()
-            blue_tinted.fill((0, 0, 255, 50), special_flags=pygame.BLEND_RGBA_MULT)
-            screen.blit(blue_tinted, position)
-        else:
-            # If no effects, just draw the normal frame
-            screen.blit(frame, position)
+        screen.blit(self.image, position)
+
+    def current_tint(self):
+        """Work out which effect colour the character should be drawn with, if any."""
+        if self.damage_timer > 0:
+            return "immunity" if self.immunity else "damage"
+        elif self.speed_cooldown:
+            return "speed"
+        return None
+
+    def __get_frames(self, action, facing_left, tint):
+        key = (action, facing_left, tint)
+        frames = self.frame_table.get(key)
+        if frames is None:
+            # Tint a copy of the untinted frames, facing the right way
+            frames = []
+            for frame in self.frame_table[(action, facing_left, None)]:
+                tinted = frame.copy()
+                tinted.fill(TINTS[tint], special_flags=pygame.BLEND_RGBA_MULT)
+                frames.append(tinted)
+            frames = tuple(frames)
+            self.frame_table[key] = frames
+        return frames
+
+    def frame_table_bytes(self):
+        """Memory used by the mirrored and tinted frames this character has built."""
+        total = 0
+        for (action, facing_left, tint), frames in self.frame_table.items():
+            if facing_left or tint:  # The plain frames are shared with the asset manager
+                total += sum(frame.get_width() * frame.get_height() * frame.get_bytesize() for frame in frames)
+        return total
+
+    @classmethod
+    def asset_keys(cls, action_paths):
+        """load_frames arguments for each sprite sheet, so they can be preloaded."""
+        return [(path, cls.sprite_size, cls.sprite_size, cls.scale_factor, "alpha") for path in action_paths.values()]
 
     def __load_sprites(self, image_path):
         """Load a sprite sheet from an image and split it into individual frames."""
         try:
-            sheet = pygame.image.load(image_path).convert_alpha()  # Load the image and keep transparency
-            sprite_width = 32  # Original sprite width (assumed size for character)
-            sprite_height = 32  # Original sprite height
-            scale_factor = 2  # Scale the sprites to make them bigger
-            scaled_sprites = []  # List to store scaled sprites
-
-            # Loop through the sprite sheet and extract individual sprites
-            for y in range(sheet.get_height() // sprite_height):  # Loop through rows
-                for x in range(sheet.get_width() // sprite_width):  # Loop through columns
-                    rect = pygame.Rect(x * sprite_width, y * sprite_height, sprite_width, sprite_height)
-                    sprite = sheet.subsurface(rect)  # Extract individual sprite
-                    # Scale the sprite and add it to the list
-                    scaled_sprite = pygame.transform.scale(sprite, (sprite_width * scale_factor, sprite_height * scale_factor))
-                    scaled_sprites.append(scaled_sprite)
-
-            return scaled_sprites  # Return the list of scaled sprites
+            # The asset manager slices the sheet into sprites and keeps them for the next Character
+            return assets.load_frames(image_path, self.sprite_size, self.sprite_size, scale=self.scale_factor)
         except Exception as e:
             print(f"Error loading character; {e}")  # Print any errors if loading fails
             exit()
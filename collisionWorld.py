@@ -0,0 +1,83 @@
+# Layers, one bit each so a mask can name several
+PLAYER = 1
+ENEMY = 2
+TRAP = 4
+FRUIT = 8
+LAVA = 16
+
+CELL_WIDTH = 128  # Width of a column of the broad phase grid, about two enemies wide
+
+# Something that can collide. The world reads owner.rect every step, None meaning it can't be touched right now.
+class Body:
+    __slots__ = ("owner", "layer", "mask", "tile_hit_size")
+
+    def __init__(self, owner, layer, mask, tile_hit_size):
+        self.owner = owner
+        self.layer = layer
+        self.mask = mask  # Layers this body wants contacts with
+        self.tile_hit_size = tile_hit_size  # (width, height) of the hit box at each tile of a field, like lava
+
+# Every collidable thing in the game, checked in one pass a step. Bodies are put into columns along x,
+# since the game scrolls sideways, and only bodies sharing a column with one that wants them are compared.
+class CollisionWorld:
+    def __init__(self, cell_width=CELL_WIDTH):
+        self.cell_width = cell_width
+        self.bodies = {}  # owner -> Body, in the order they were added
+        self.fields = []  # Bodies with many tiles that test themselves with owner.collides(rect, hit_width, hit_height)
+        self.pair_tests = 0  # Rect comparisons in the last step, for debugging and benchmarks
+
+    def add(self, owner, layer, mask=0, tile_hit_size=None):
+        """Register an owner with a rect attribute and return its body."""
+        body = Body(owner, layer, mask, tile_hit_size)
+        self.bodies[owner] = body
+        return body
+
+    def add_field(self, owner, layer):
+        """Register something made of many tiles, like the lava, that checks rects against itself."""
+        body = Body(owner, layer, 0, None)
+        self.fields.append(body)
+        return body
+
+    def remove(self, owner):
+        self.bodies.pop(owner, None)
+
+    def step(self):
+        """Return every touching pair of bodies whose masks ask for each other, lower layer first."""
+        cells = {}  # Column -> every body in it
+        seekers = []  # Bodies with a mask, the only ones that start comparisons
+        placed = []
+        cell_width = self.cell_width
+        for order, body in enumerate(self.bodies.values()):
+            rect = body.owner.rect
+            if rect is None:
+                continue
+            entry = (order, body, rect)
+            placed.append(entry)
+            first, last = rect.left // cell_width, (rect.right - 1) // cell_width
+            for cell in range(first, last + 1):
+                cells.setdefault(cell, []).append(entry)
+            if body.mask:
+                seekers.append((entry, first, last))
+
+        contacts = []
+        tests = 0
+        for (a_order, a, a_rect), first, last in seekers:
+            for cell in range(first, last + 1):
+                for b_order, b, b_rect in cells[cell]:
+                    if not a.mask & b.layer or b is a:
+                        continue
+                    if b.mask & a.layer and b_order < a_order:
+                        continue  # Both want each other, the earlier one reports it
+                    # Pairs sharing several columns are only reported in the one where they both start
+                    if max(a_rect.left, b_rect.left) // cell_width != cell:
+                        continue
+                    tests += 1
+                    if a_rect.colliderect(b_rect):
+                        contacts.append((a, b) if a.layer <= b.layer else (b, a))
+
+        for field in self.fields:
+            for order, body, rect in placed:
+                if body.mask & field.layer and field.owner.collides(rect, *body.tile_hit_size):
+                    contacts.append((body, field))
+        self.pair_tests = tests
+        return contacts
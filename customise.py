@@ -1,15 +1,15 @@
 import pygame
 import os
-from database import Database
-from character import Character
+from database import repository
+from character import Character, character_paths
+from assetManager import assets
 from button import Button
-from variables import WIDTH, HEIGHT, FPS
+from variables import WIDTH, HEIGHT
+from sceneManager import Scene
 
-class Customise:
-    def __init__(self, menu):
+class Customise(Scene):
+    def __init__(self):
         # Initialize the customisation screen
-        self.menu = menu  # The main menu object to return to when exiting
-        self.clock = pygame.time.Clock()  # Clock to control the frame rate
         self.screen = pygame.display.set_mode((WIDTH, HEIGHT))  # Set the screen size for the window
         pygame.display.set_caption("Customisation")  # Set the window title to "Customisation"
 
@@ -20,13 +20,16 @@ class Customise:
         self.character_directories = self.__get_character_directories("./assets/MainCharacters")
 
         # Load the saved character from the database, if it exists
-        with Database() as db:
-            saved_character = db.getCharacter()  # Retrieve the saved character from the database
+        saved_character = repository.getCharacter()  # Retrieve the saved character from the database
         # Set the selected character to the saved one, or default to the first one if none saved
         self.selected_character = self.character_directories.index(saved_character) if saved_character in self.character_directories else 0
 
+        # Decode every character's sheets in the background so switching between them doesn't stall
+        self.preload = assets.preload([key for name in self.character_directories for key in Character.asset_keys(character_paths(name))])
+        self.characters = {}  # Index -> Character already built, so going back to one doesn't build it again
+
         # Create the player character with the loaded sprites for the selected character
-        self.player = Character(self.__load_character_sprites(self.character_directories[self.selected_character]))
+        self.player = self.__get_character(self.selected_character)
 
         # Create buttons for navigating between characters and exiting to the menu
         self.button_left = Button("<", 150, HEIGHT // 2, 50, 50, self.__previous_character)  # Left button to go to the previous character
@@ -46,36 +49,32 @@ class Customise:
         """Fetch all directories (character folders) from the given base path."""
         return [f for f in os.listdir(base_path) if os.path.isdir(os.path.join(base_path, f))]
     
-    def __load_character_sprites(self, character_name):
-        """Load the sprite paths for a given character from its directory."""
-        base_path = f"./assets/MainCharacters/{character_name}"  # Construct base path to character's sprite folder
-        return {
-            "idle": f"{base_path}/idle.png",
-            "run": f"{base_path}/run.png",
-            "jump": f"{base_path}/jump.png",
-            "double_jump": f"{base_path}/double_jump.png"
-        }
+    def __get_character(self, index):
+        """The character at index, built from the preloaded sheets the first time it's shown."""
+        if index not in self.characters:
+            self.characters[index] = Character(character_paths(self.character_directories[index]))
+        return self.characters[index]
     
     def __previous_character(self):
         """Switch to the previous character in the list."""
         # Update selected character index to the previous one, looping back to the last character if needed
         self.selected_character = (self.selected_character - 1) % len(self.character_directories)
-        # Reload the player character with new sprites based on selected character
-        self.player = Character(self.__load_character_sprites(self.character_directories[self.selected_character]))
+        # Show the character with sprites for the selected character
+        self.player = self.__get_character(self.selected_character)
     
     def __next_character(self):
         """Switch to the next character in the list."""
         # Update selected character index to the next one, looping to the first character if needed
         self.selected_character = (self.selected_character + 1) % len(self.character_directories)
-        # Reload the player character with new sprites based on selected character
-        self.player = Character(self.__load_character_sprites(self.character_directories[self.selected_character]))
+        # Show the character with sprites for the selected character
+        self.player = self.__get_character(self.selected_character)
     
     def __back_to_menu(self):
         """Save the selected character and return to the main menu."""
-        with Database() as db:
-            # Update the database with the selected character's name
-            db.updateCharacter(self.character_directories[self.selected_character])
-        self.menu.run()  # Return to the main menu by calling the `run` method of the menu
+        # Update the database with the selected character's name
+        repository.updateCharacter(self.character_directories[self.selected_character])
+        repository.flush()  # Saved in the background as we leave the screen
+        self.manager.pop()  # Return to the main menu underneath this screen
     
     def draw(self):
         """Draw everything on the screen."""
@@ -96,28 +95,22 @@ class Customise:
 
         pygame.display.flip()  # Update the display with the drawn elements
     
-    def run(self):
-        """Main loop to run the customisation screen."""
-        while True:
-            self.clock.tick(FPS)  # Control the frame rate of the game loop
-            for event in pygame.event.get():  # Loop through all events (key presses, mouse clicks, etc.)
-                if event.type == pygame.QUIT:  # If the window is closed
-                    pygame.quit()  # Quit pygame
-                    exit()  # Exit the program
-
-                if event.type == pygame.KEYDOWN:  # If a key is pressed down
-                    if event.key == pygame.K_LEFT or event.key == pygame.K_a:  # Left arrow or 'A' to go to previous character
-                        self.__previous_character()
-                    elif event.key == pygame.K_RIGHT or event.key == pygame.K_d:  # Right arrow or 'D' to go to next character
-                        self.__next_character()
-                    elif event.key == pygame.K_q:  # 'Q' key to save the character and return to the main menu
-                        with Database() as db:
-                            db.updateCharacter(self.character_directories[self.selected_character])  # Save selected character
-                        self.menu.run()  # Go back to the main menu
+    def handle_event(self, event):
+        """Handle key presses and button clicks."""
+        if event.type == pygame.KEYDOWN:  # If a key is pressed down
+            if event.key == pygame.K_LEFT or event.key == pygame.K_a:  # Left arrow or 'A' to go to previous character
+                self.__previous_character()
+            elif event.key == pygame.K_RIGHT or event.key == pygame.K_d:  # Right arrow or 'D' to go to next character
+                self.__next_character()
+            elif event.key == pygame.K_q:  # 'Q' key to save the character and return to the main menu
+                self.__back_to_menu()
+                return
 
-                # Handle all button events (clicks, mouse movements, etc.)
-                self.button_left.handle_event(event)
-                self.button_right.handle_event(event)
-                self.button_back.handle_event(event)
+        # Handle all button events (clicks, mouse movements, etc.)
+        self.button_left.handle_event(event)
+        self.button_right.handle_event(event)
+        self.button_back.handle_event(event)
 
-            self.draw()  # Draw all elements on the screen after handling events
+    def frame(self):
+        self.preload.update()  # Finish a few preloaded sheets each frame
+        self.draw()  # Draw all elements on the screen after handling events
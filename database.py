@@ -1,4 +1,5 @@
 import sqlite3
+import threading
 
 def parse():
     with open("./assets/Database/init.sql") as f:
@@ -93,4 +94,108 @@ class Database:
     
     def updateEffectsState(self,value):
         self.__cursor.execute(f"UPDATE Settings SET Effects = ?;",(value,))
-        self.commit = True
\ No newline at end of file
+        self.commit = True
+
+    def getSettings(self):
+        self.__cursor.execute("SELECT Character, NumberEnemies, Effects FROM Settings")
+        return self.__cursor.fetchone()
+
+    def getEnemyDamages(self):
+        self.__cursor.execute("SELECT Animal, Damage FROM Enemies")
+        return dict(self.__cursor.fetchall())
+
+    def getTrapDamages(self):
+        self.__cursor.execute("SELECT Type, Damage FROM Traps")
+        return dict(self.__cursor.fetchall())
+
+# Keeps the settings and damage tables in memory so the game loop never opens the database
+class Repository:
+    def __init__(self):
+        self.__loaded = False
+        self.__dirty = False
+        self.__lock = threading.Lock()  # Stops two writers saving at the same time
+        self.__writer = None
+        self.__snapshots = 0  # Number of snapshots handed to writers, each one's sequence number
+        self.__written = 0  # Sequence number of the newest snapshot saved
+        self.settings = {"Character": "MaskDude", "NumberEnemies": 2, "Effects": "y"}  # Defaults from init.sql
+        self.enemy_damage = {}
+        self.trap_damage = {}
+
+    def load(self):
+        """Read every table once. Called automatically on the first lookup."""
+        try:
+            with Database() as db:
+                character, number, effects = db.getSettings()
+                self.settings = {"Character": character, "NumberEnemies": number, "Effects": effects}
+                self.enemy_damage = db.getEnemyDamages()
+                self.trap_damage = db.getTrapDamages()
+        except Exception as e:
+            print(f"Error loading from the database: {e}")
+        self.__loaded = True
+
+    def __ensure_loaded(self):
+        if not self.__loaded:
+            self.load()
+
+    def getDamageEnemy(self, enemy):
+        self.__ensure_loaded()
+        return self.enemy_damage[enemy]
+
+    def getDamageTrap(self, trap):
+        self.__ensure_loaded()
+        return self.trap_damage[trap]
+
+    def getCharacter(self):
+        self.__ensure_loaded()
+        return self.settings["Character"]
+
+    def getNumberofEnemies(self):
+        self.__ensure_loaded()
+        return self.settings["NumberEnemies"]
+
+    def getEffectsState(self):
+        self.__ensure_loaded()
+        return self.settings["Effects"]
+
+    def __update(self, key, value):
+        self.__ensure_loaded()
+        if self.settings[key] != value:
+            self.settings[key] = value
+            self.__dirty = True
+
+    def updateCharacter(self, character):
+        self.__update("Character", character)
+
+    def updateNumberofEnemies(self, number):
+        self.__update("NumberEnemies", number)
+
+    def updateEffectsState(self, value):
+        self.__update("Effects", value)
+
+    def flush(self, wait=False):
+        """Save changed settings on a background thread. Call this when leaving a screen, not during a frame."""
+        if not self.__dirty:
+            return
+        self.__dirty = False
+        settings = dict(self.settings)  # Snapshot so later changes don't race with the writer
+        self.__snapshots += 1
+        self.__writer = threading.Thread(target=self.__write, args=(settings, self.__snapshots))
+        self.__writer.start()
+        if wait:
+            self.__writer.join()
+
+    def __write(self, settings, sequence):
+        with self.__lock:
+            if sequence < self.__written:
+                return  # Writers don't get the lock in order, a newer snapshot is already saved
+            self.__written = sequence
+            try:
+                with Database() as db:
+                    db.updateCharacter(settings["Character"])
+                    db.updateNumberofEnemies(settings["NumberEnemies"])
+                    db.updateEffectsState(settings["Effects"])
+            except Exception as e:
+                print(f"Error saving settings to database: {e}")
+
+# One repository for the whole game
+repository = Repository()
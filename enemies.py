@@ -1,11 +1,11 @@
 import pygame
 import random
-from gameMusic import Effects
+from gameMusic import effects
 from variables import HEIGHT,TERRAIN,WIDTH
-from database import Database
-from functools import lru_cache
-
-effects = Effects()
+from database import repository
+from assetManager import assets
+from gameClock import game_clock, interpolate
+from objectPool import pools
 
 previous_land_enemy = None
 previous_air_enemy = None
@@ -13,49 +13,53 @@ previous_air_enemy = None
 class LandEnemy:
     def __init__(self, x, y, sprite_sheet,name, frame_width, frame_height):
         self.sprite_sheets = sprite_sheet
-        self.current_animation = "run"
         # Setting frame width and height
         self.frame_width = frame_width
         self.frame_height = frame_height 
         self.type = name
+        self.camera_speed = 1
+        self.frame_rate = 100  # Time between frames (in milliseconds)
+        self.hit_duration = 2000  # Duration of the hit animation in milliseconds
+        self.reset(x, y)
+
+    def reset(self, x, y):
+        """Put the enemy back to how it starts at a new position, so a pooled enemy can be spawned again."""
+        self.current_animation = "run"
         self.frames = self.load_frames(self.sprite_sheets[self.current_animation])
         self.current_frame = 0
         self.image = self.frames[self.current_frame]
         self.rect = self.image.get_rect(topleft=(x, y))
+        self.previous_position = self.rect.topleft  # Position at the last simulation step, for drawing between steps
         self.speed = random.randint(2, 4)
-        self.camera_speed = 1
 
-        self.last_frame_time = pygame.time.get_ticks()
-        self.frame_rate = 100  # Time between frames (in milliseconds)
+        self.last_frame_time = game_clock.get_ticks()
 
         # Die logic
         self.is_hit = False
         self.is_visible = True
-        self.hit_duration = 2000  # Duration of the hit animation in milliseconds
         self.hit_start_time = 0  # Time when the hit animation starts
+        self.in_lava = False  # Set by the game each step, enemies in the lava aren't drawn
+
+    @property
+    def tile_hit_size(self):
+        """Size of the hit box at each lava tile when checking this enemy against the lava."""
+        return (32, 32)
 
-    @lru_cache(maxsize=None)
     def load_frames(self, sprite_sheet_path):
         """Extract individual frames from a sprite sheet and scale them up."""
-        sprite_sheet = pygame.image.load(sprite_sheet_path).convert_alpha()
-        frames = []
-        for i in range(sprite_sheet.get_width() // self.frame_width):
-            frame = sprite_sheet.subsurface(pygame.Rect(i * self.frame_width, 0, self.frame_width, self.frame_height))
-            # Scale up the frame
-            scaled_frame = pygame.transform.scale(frame, (self.frame_width * 2, self.frame_height * 2))
-            frames.append(scaled_frame)
-        return frames
+        return assets.load_frames(sprite_sheet_path, self.frame_width, self.frame_height, scale=2)
     
     def take_damage(self):
         """Trigger the hit animation."""
         self.is_hit = True
-        self.hit_start_time = pygame.time.get_ticks()  # Record the time when hit
+        self.hit_start_time = game_clock.get_ticks()  # Record the time when hit
         self.set_animation("hit")  # Set the animation to hit
         self.rect.y -= 2 # Ensures enemy sprite stays on top of the terrain as the hit animation goes downwards
 
     def update(self, camera_x):
         """Move enemy from right to left and update animation."""
-        now = pygame.time.get_ticks()
+        self.previous_position = self.rect.topleft
+        now = game_clock.get_ticks()
 
         # Check if the enemy is in the hit state
         if self.is_hit:
@@ -78,15 +82,19 @@ class LandEnemy:
             if self.rect.right - camera_x < 0:
                 self.rect.x = random.randint(800, 1200) + camera_x  # Respawn off-screen
 
-    def draw(self, screen, camera_x, lava_tiles):
-        if self.is_visible:
-            player_rect = pygame.Rect(self.rect.x, self.rect.y, self.image.get_width(), self.image.get_height())
-            for tile in lava_tiles:
-                lava_rect = pygame.Rect(tile[0], tile[1], 32, 32)
-                if player_rect.colliderect(lava_rect):
-                    effects.play_effect("bbq")
-                    return  # don't draw the enemy if it's colliding with lava
-            screen.blit(self.image, (self.rect.x - camera_x, self.rect.y))
+    def sprite(self, alpha=1.0):
+        """(image, world x, y) to draw part way between the last two simulation steps, or None if hidden."""
+        if self.is_visible and not self.in_lava:  # don't draw the enemy if it's colliding with lava
+            x = interpolate(self.previous_position[0], self.rect.x, alpha)
+            y = interpolate(self.previous_position[1], self.rect.y, alpha)
+            return self.image, x, y
+        return None
+
+    def draw(self, screen, camera_x, alpha=1.0):
+        sprite = self.sprite(alpha)
+        if sprite:
+            image, x, y = sprite
+            screen.blit(image, (x - camera_x, y))
 
     def check_collision(self, player_rect):
         """Check if enemy collides with the player."""
@@ -98,7 +106,7 @@ class LandEnemy:
             self.current_animation = animation
             self.frames = self.load_frames(self.sprite_sheets[self.current_animation])
             self.current_frame = 0
-            self.last_frame_time = pygame.time.get_ticks()
+            self.last_frame_time = game_clock.get_ticks()
 
 class Chicken(LandEnemy):
     def __init__(self,x,y,name="Chicken",frame_width=32,frame_height=34):
@@ -108,13 +116,16 @@ class Chicken(LandEnemy):
             "hit": "./assets/Enemies/Chicken/Hit (32x34).png"
         }
         super().__init__(x, y, sprite_sheets,name,frame_width,frame_height)
+
+    def reset(self, x, y):
+        super().reset(x, y)
         effects.play_effect("chicken")
     
     def spawn(camera_x):
         """Spawn a Chicken at a random x position and a fixed y position."""
         x = camera_x + WIDTH + random.randint(100, 500)  # Random x position
         y = HEIGHT - TERRAIN  # Fixed y position for Chicken (adjust as needed)
-        return Chicken(x, y)
+        return pools.acquire(Chicken, x, y)  # Reuse a released Chicken if there is one
 
 class Rino(LandEnemy):
     def __init__(self,x,y,name="Rino",frame_width=52,frame_height=34):
@@ -124,6 +135,9 @@ class Rino(LandEnemy):
             "hit": "./assets/Enemies/Rino/Hit (52x34).png"
         }
         super().__init__(x, y, sprite_sheets,name,frame_width,frame_height)
+
+    def reset(self, x, y):
+        super().reset(x, y)
         self.speed = 5
         effects.play_effect("rino")
     
@@ -131,7 +145,7 @@ class Rino(LandEnemy):
         """Spawn a Rino at a random x position and a fixed y position."""
         x = camera_x + WIDTH + random.randint(100, 500)  # Random x position
         y = HEIGHT - TERRAIN  # Fixed y position for Rino (adjust as needed)
-        return Rino(x, y)
+        return pools.acquire(Rino, x, y)  # Reuse a released Rino if there is one
 
 class Bunny(LandEnemy):
     def __init__(self,x,y,name="Bunny",frame_width=34,frame_height=44):
@@ -142,11 +156,14 @@ class Bunny(LandEnemy):
             "jump": "./assets/Enemies/Bunny/Jump.png"  # Use the uploaded jump sprite
         }
         super().__init__(x, y, sprite_sheets,name,frame_width,frame_height)
+
+    def reset(self, x, y):
+        super().reset(x, y)
         effects.play_effect("bunny")
 
         # Jump logic
         self.is_jumping = False
-        self.jump_start_time = pygame.time.get_ticks()
+        self.jump_start_time = game_clock.get_ticks()
         self.jump_cooldown = 3000  # Jump every 3 seconds
         self.jump_velocity = -10
         self.gravity = 0.5
@@ -156,11 +173,12 @@ class Bunny(LandEnemy):
         """Spawn a Bunny at a random x position and a fixed y position."""
         x = camera_x + random.randint(800, 1200)
         y = HEIGHT - TERRAIN - 21
-        return Bunny(x, y)
+        return pools.acquire(Bunny, x, y)  # Reuse a released Bunny if there is one
     
     def update(self, camera_x):
         """Move enemy from right to left, update animation, and handle jumping."""
-        now = pygame.time.get_ticks()
+        self.previous_position = self.rect.topleft
+        now = game_clock.get_ticks()
 
         # Check if the bunny is in the hit state
         if self.is_hit:
@@ -190,6 +208,7 @@ class Bunny(LandEnemy):
             self.rect.x -= self.speed
             if self.rect.right - camera_x < 0:
                 self.rect.x = random.randint(800, 1200) + camera_x
+                self.previous_position = self.rect.topleft
 
         # Handle jumping
         if now - self.jump_start_time >= self.jump_cooldown and self.is_visible and not self.is_hit:
@@ -209,48 +228,52 @@ class Bunny(LandEnemy):
 class AirEnemy:
     def __init__(self, x, y, sprite_sheet,name, frame_width, frame_height):
         self.sprite_sheets = sprite_sheet
-        self.current_animation = "fly"
         self.frame_width = frame_width
         self.frame_height = frame_height
         self.type = name
+        self.camera_speed = 1
+        self.frame_rate = 100  # Time between frames (in milliseconds)
+        self.hit_duration = 2000  # Duration of the hit animation in milliseconds
+        self.reset(x, y)
+
+    def reset(self, x, y):
+        """Put the enemy back to how it starts at a new position, so a pooled enemy can be spawned again."""
+        self.current_animation = "fly"
         self.frames = self.load_frames(self.sprite_sheets[self.current_animation], self.frame_width, self.frame_height)
         self.current_frame = 0
         self.image = self.frames[self.current_frame]
         self.rect = self.image.get_rect(topleft=(x, y))
+        self.previous_position = self.rect.topleft  # Position at the last simulation step, for drawing between steps
         self.speed = random.randint(1, 3)  # Enemy moves slower
-        self.camera_speed = 1
         self.direction = random.choice([-1, 1])  # Random vertical movement direction
 
-        self.last_frame_time = pygame.time.get_ticks()
-        self.frame_rate = 100  # Time between frames (in milliseconds)
+        self.last_frame_time = game_clock.get_ticks()
 
         # Die logic
         self.is_hit = False
         self.is_visible = True
-        self.hit_duration = 2000  # Duration of the hit animation in milliseconds
         self.hit_start_time = 0  # Time when the hit animation starts
+        self.in_lava = False  # Set by the game each step, enemies in the lava aren't drawn
+
+    @property
+    def tile_hit_size(self):
+        """Size of the hit box at each lava tile when checking this enemy against the lava."""
+        return (self.frame_width, self.frame_height)
     
     def take_damage(self):
         """Trigger the hit animation."""
         self.is_hit = True
-        self.hit_start_time = pygame.time.get_ticks()  # Record the time when hit
+        self.hit_start_time = game_clock.get_ticks()  # Record the time when hit
         self.set_animation("hit")  # Set the animation to hit
 
-    @lru_cache(maxsize=None)
     def load_frames(self, sprite_sheet_path, frame_width, frame_height):
         """Extract individual frames from a sprite sheet and scale them up."""
-        sprite_sheet = pygame.image.load(sprite_sheet_path)
-        frames = []
-        for i in range(sprite_sheet.get_width() // frame_width):
-            frame = sprite_sheet.subsurface(pygame.Rect(i * frame_width, 0, frame_width, frame_height))
-            # Scale up the frame
-            scaled_frame = pygame.transform.scale(frame, (frame_width * 2, frame_height * 2))
-            frames.append(scaled_frame)
-        return frames
+        return assets.load_frames(sprite_sheet_path, frame_width, frame_height, scale=2)
 
     def update(self, camera_x):
         """Move the enemy from right to left with vertical movement and update animation."""
-        now = pygame.time.get_ticks()
+        self.previous_position = self.rect.topleft
+        now = game_clock.get_ticks()
 
         if self.is_hit:
         # Check if the hit animation duration has passed
@@ -283,17 +306,22 @@ class AirEnemy:
             if self.rect.right - camera_x < 0:
                 self.rect.x = random.randint(800, 1200) + camera_x  # Respawn off-screen
                 self.rect.y = random.randint(100, 300)  # Reset y position
+                self.previous_position = self.rect.topleft  # Don't slide across the screen to the new position
                 self.set_animation("fly")  # Reset to flying animation
 
-    def draw(self, screen, camera_x, lava_tiles):
-        if self.is_visible:
-            player_rect = pygame.Rect(self.rect.x, self.rect.y, self.image.get_width(), self.image.get_height())
-            for tile in lava_tiles:
-                lava_rect = pygame.Rect(tile[0], tile[1], self.frame_height, self.frame_width)
-                if player_rect.colliderect(lava_rect):
-                    effects.play_effect("bbq")
-                    return  # Don't draw the enemy if it's colliding with lava
-            screen.blit(self.image, (self.rect.x - camera_x, self.rect.y))
+    def sprite(self, alpha=1.0):
+        """(image, world x, y) to draw part way between the last two simulation steps, or None if hidden."""
+        if self.is_visible and not self.in_lava:  # Don't draw the enemy if it's colliding with lava
+            x = interpolate(self.previous_position[0], self.rect.x, alpha)
+            y = interpolate(self.previous_position[1], self.rect.y, alpha)
+            return self.image, x, y
+        return None
+
+    def draw(self, screen, camera_x, alpha=1.0):
+        sprite = self.sprite(alpha)
+        if sprite:
+            image, x, y = sprite
+            screen.blit(image, (x - camera_x, y))
 
     def check_collision(self, player_rect):
         """Check if enemy collides with the player."""
@@ -305,7 +333,7 @@ class AirEnemy:
             self.current_animation = animation
             self.frames = self.load_frames(self.sprite_sheets[self.current_animation], self.frame_width, self.frame_height)
             self.current_frame = 0
-            self.last_frame_time = pygame.time.get_ticks()
+            self.last_frame_time = game_clock.get_ticks()
 
 class BlueBird(AirEnemy):
     def __init__(self,x,y,name="BlueBird",frame_width=32,frame_height=32):
@@ -314,13 +342,16 @@ class BlueBird(AirEnemy):
             "hit": "./assets/Enemies/BlueBird/Hit (32x32).png"
         }
         super().__init__(x, y, sprite_sheets,name,frame_width,frame_height)
+
+    def reset(self, x, y):
+        super().reset(x, y)
         effects.play_effect("bat")
     
     def spawn(camera_x):
         """Spawn a Bird at a random x position and a fixed y position."""
         x = camera_x + WIDTH + random.randint(100, 500)
         y = ((HEIGHT - TERRAIN) // 2) + random.randint(10,50)
-        return BlueBird(x, y)
+        return pools.acquire(BlueBird, x, y)  # Reuse a released BlueBird if there is one
 
 class Bat(AirEnemy):
     def __init__(self,x,y,name="Bat",frame_width=46,frame_height=30):
@@ -330,13 +361,16 @@ class Bat(AirEnemy):
             "hit": "./assets/Enemies/Bat/Hit (46x30).png"
         }
         super().__init__(x, y, sprite_sheets,name,frame_width,frame_height)
+
+    def reset(self, x, y):
+        super().reset(x, y)
         effects.play_effect("bat")
     
     def spawn(camera_x):
         """Spawn a Bat at a random x position and a fixed y position."""
         x = camera_x + WIDTH + random.randint(100, 500)
         y = ((HEIGHT - TERRAIN) // 2) + random.randint(10,50)
-        return Bat(x, y)
+        return pools.acquire(Bat, x, y)  # Reuse a released Bat if there is one
 
 class Bee(AirEnemy):
     def __init__(self,x,y,name="Bee",frame_width=36,frame_height=34):
@@ -346,13 +380,16 @@ class Bee(AirEnemy):
             "hit": "./assets/Enemies/Bee/Hit (36x34).png"
         }
         super().__init__(x, y, sprite_sheets,name,frame_width,frame_height)
+
+    def reset(self, x, y):
+        super().reset(x, y)
         effects.play_effect("bee")
     
     def spawn(camera_x):
         """Spawn a Bee at a random x position and a fixed y position."""
         x = camera_x + WIDTH + random.randint(100, 500) 
         y = ((HEIGHT - TERRAIN) // 2) + random.randint(10,50)
-        return Bee(x, y)
+        return pools.acquire(Bee, x, y)  # Reuse a released Bee if there is one
 
 enemy_land = [Bunny,Chicken,Rino]
 enemy_air = [Bee,Bat,BlueBird]
@@ -374,8 +411,7 @@ def generate_random_enemy(camera_x):
     previous_air_enemy = air_enemy
 
     # Return different amounts of enemies depending on user's choice in settings
-    with Database() as db:
-        number = db.getNumberofEnemies()
+    number = repository.getNumberofEnemies()
     
     match number:
         case 1:
@@ -0,0 +1,246 @@
+import pygame
+from variables import HEIGHT, TERRAIN
+import numpy as np
+from gameClock import game_clock, interpolate
+
+# Kinds of enemy, they move differently
+LAND = 0
+BUNNY = 1
+AIR = 2
+
+BUNNY_GROUND = HEIGHT - TERRAIN - 21  # y a jumping Bunny lands back on
+
+# Positions, speeds, timers and hit state of every enemy in NumPy arrays, one slot per enemy, so all of
+# them move in one step per frame. The enemy objects keep their frames and animation names and are only
+# touched when an animation changes.
+class EnemyStore:
+    def __init__(self, capacity=64, seed=None):
+        self.rng = np.random.default_rng(seed)  # Own generator, so a seeded run always moves the same way
+        self.capacity = 0
+        self.free = []  # Unused slots
+        self.enemies = []  # slot -> enemy object, None if the slot is free
+        self.__grow(capacity)
+
+    def __grow(self, capacity):
+        """Make room for capacity enemies, keeping the ones already stored."""
+        columns = {
+            "used": bool, "kind": np.int8, "x": np.int64, "y": np.int64, "prev_x": np.int64, "prev_y": np.int64,
+            "width": np.int64, "height": np.int64, "speed": np.int64, "direction": np.int64,
+            "vertical_speed": np.float64, "gravity": np.float64, "jumping": bool, "jump_start": np.int64,
+            "jump_cooldown": np.int64, "jump_velocity": np.float64, "hit": bool, "hit_start": np.int64,
+            "hit_duration": np.int64, "visible": bool, "frame": np.int64, "frame_count": np.int64,
+            "last_frame_time": np.int64, "frame_rate": np.int64,
+        }
+        for name, dtype in columns.items():
+            array = np.zeros(capacity, dtype=dtype)
+            if self.capacity:
+                array[:self.capacity] = getattr(self, name)
+            setattr(self, name, array)
+        self.free.extend(range(capacity - 1, self.capacity - 1, -1))  # Lowest slots are used first
+        self.enemies.extend([None] * (capacity - self.capacity))
+        self.capacity = capacity
+
+    def __len__(self):
+        return self.capacity - len(self.free)
+
+    def add(self, enemy):
+        """Copy a freshly spawned enemy's state into a slot and return the view that stands in for it."""
+        if not self.free:
+            self.__grow(self.capacity * 2)
+        slot = self.free.pop()
+        self.enemies[slot] = enemy
+        self.used[slot] = True
+        self.kind[slot] = AIR if hasattr(enemy, "direction") else BUNNY if hasattr(enemy, "jump_cooldown") else LAND
+        self.x[slot], self.y[slot] = enemy.rect.topleft
+        self.prev_x[slot], self.prev_y[slot] = enemy.previous_position
+        self.width[slot], self.height[slot] = enemy.rect.size
+        self.speed[slot] = enemy.speed
+        self.direction[slot] = getattr(enemy, "direction", 0)
+        self.vertical_speed[slot] = getattr(enemy, "vertical_speed", 0)
+        self.gravity[slot] = getattr(enemy, "gravity", 0)
+        self.jumping[slot] = getattr(enemy, "is_jumping", False)
+        self.jump_start[slot] = getattr(enemy, "jump_start_time", 0)
+        self.jump_cooldown[slot] = getattr(enemy, "jump_cooldown", 0)
+        self.jump_velocity[slot] = getattr(enemy, "jump_velocity", 0)
+        self.hit[slot] = enemy.is_hit
+        self.hit_start[slot] = enemy.hit_start_time
+        self.hit_duration[slot] = enemy.hit_duration
+        self.visible[slot] = enemy.is_visible
+        self.frame[slot] = enemy.current_frame
+        self.frame_count[slot] = len(enemy.frames)
+        self.last_frame_time[slot] = enemy.last_frame_time
+        self.frame_rate[slot] = enemy.frame_rate
+        return EnemyView(self, slot)
+
+    def remove(self, view):
+        """Free a view's slot and return its enemy object, e.g. to give back to its pool."""
+        enemy = self.enemies[view.slot]
+        self.enemies[view.slot] = None
+        self.used[view.slot] = False
+        self.free.append(view.slot)
+        return enemy
+
+    def set_animation(self, slot, animation, now):
+        """Switch one enemy's animation, the only part of an update that goes back to the enemy object."""
+        enemy = self.enemies[slot]
+        if animation in enemy.sprite_sheets and animation != enemy.current_animation:
+            enemy.current_animation = animation
+            enemy.frames = enemy.load_frames(*enemy_frame_args(enemy))
+            self.frame[slot] = 0
+            self.frame_count[slot] = len(enemy.frames)
+            self.last_frame_time[slot] = now
+
+    def update(self, camera_x):
+        """Move and animate every stored enemy, the same rules as LandEnemy, Bunny and AirEnemy.update."""
+        if not len(self):
+            return
+        now = game_clock.get_ticks()
+        used = self.used
+        bunny = used & (self.kind == BUNNY)
+        air = used & (self.kind == AIR)
+        self.prev_x[:] = self.x
+        self.prev_y[:] = self.y
+
+        # Enemies that were hit disappear once the hit animation has played, flying ones drop while it does
+        hit = used & self.hit
+        expired = hit & (now - self.hit_start >= self.hit_duration)
+        self.visible[expired] = False
+        self.y[air & hit & ~expired] += 2
+
+        # Next animation frame every frame_rate milliseconds
+        due = used & self.visible & (now - self.last_frame_time >= self.frame_rate)
+        self.last_frame_time[due] = now
+        self.frame[due] = (self.frame[due] + 1) % self.frame_count[due]
+
+        # Flying enemies always drift, then move again unless hit
+        self.x[air] -= self.speed[air]
+        self.y[air] += self.direction[air]
+        moving = used & self.visible & ~self.hit
+        self.x[moving] -= self.speed[moving]
+        flying = air & moving
+        self.y[flying] += self.direction[flying]
+        flip = flying & (self.rng.integers(0, 51, self.capacity) == 0)
+        self.direction[flip] *= -1
+
+        # Anything that has gone off the left of the screen comes back in off the right
+        gone = moving & (self.x + self.width - camera_x < 0)
+        count = int(gone.sum())
+        respawned = ()
+        if count:
+            self.x[gone] = self.rng.integers(800, 1201, count) + camera_x
+            air_gone = gone & air
+            self.y[air_gone] = self.rng.integers(100, 301, int(air_gone.sum()))
+            self.prev_x[gone] = self.x[gone]  # Don't slide across the screen to the new position
+            self.prev_y[gone] = self.y[gone]
+            respawned = np.flatnonzero(air_gone)
+
+        # Bunnies jump every jump_cooldown milliseconds and fall back to the ground
+        jumps = bunny & moving & (now - self.jump_start >= self.jump_cooldown)
+        self.jumping[jumps] = True
+        self.vertical_speed[jumps] = self.jump_velocity[jumps]
+        self.jump_start[jumps] = now
+        falling = bunny & self.jumping & self.visible
+        self.y[falling] = np.trunc(self.y[falling] + self.vertical_speed[falling])  # Rects drop the fraction
+        self.vertical_speed[falling] += self.gravity[falling]
+        landed = falling & (self.y >= BUNNY_GROUND)
+        self.y[landed] = BUNNY_GROUND
+        self.jumping[landed] = False
+
+        # Animation changes are rare, so they're the only per-enemy work
+        for slot in np.flatnonzero(jumps & ~landed):
+            self.set_animation(slot, "jump", now)
+        for slot in np.flatnonzero(landed):
+            self.set_animation(slot, "run", now)
+        for slot in respawned:
+            self.set_animation(slot, "fly", now)
+
+def enemy_frame_args(enemy):
+    """Arguments for an enemy's load_frames, which differ between land and air enemies."""
+    path = enemy.sprite_sheets[enemy.current_animation]
+    if hasattr(enemy, "direction"):
+        return path, enemy.frame_width, enemy.frame_height
+    return (path,)
+
+# Stands in for an enemy in Play's list while its state lives in an EnemyStore. It has the parts of
+# the enemy interface the game uses, read from and written to the store's arrays.
+class EnemyView:
+    __slots__ = ("store", "slot")
+
+    def __init__(self, store, slot):
+        self.store = store
+        self.slot = slot
+
+    @property
+    def enemy(self):
+        return self.store.enemies[self.slot]
+
+    @property
+    def type(self):
+        return self.enemy.type
+
+    @property
+    def rect(self):
+        """A copy of the enemy's rect, changing it doesn't move the enemy."""
+        store, slot = self.store, self.slot
+        return pygame.Rect(int(store.x[slot]), int(store.y[slot]), int(store.width[slot]), int(store.height[slot]))
+
+    @property
+    def previous_position(self):
+        return int(self.store.prev_x[self.slot]), int(self.store.prev_y[self.slot])
+
+    @property
+    def image(self):
+        return self.enemy.frames[self.store.frame[self.slot]]
+
+    @property
+    def is_hit(self):
+        return bool(self.store.hit[self.slot])
+
+    @property
+    def is_visible(self):
+        return bool(self.store.visible[self.slot])
+
+    @property
+    def in_lava(self):
+        return self.enemy.in_lava
+
+    @in_lava.setter
+    def in_lava(self, in_lava):
+        self.enemy.in_lava = in_lava
+
+    @property
+    def tile_hit_size(self):
+        return self.enemy.tile_hit_size
+
+    def update(self, camera_x):
+        """Nothing to do, EnemyStore.update has already moved every enemy this frame."""
+
+    def take_damage(self):
+        """Trigger the hit animation."""
+        store, slot = self.store, self.slot
+        now = game_clock.get_ticks()
+        store.hit[slot] = True
+        store.hit_start[slot] = now
+        store.set_animation(slot, "hit", now)
+        if store.kind[slot] != AIR:
+            store.y[slot] -= 2  # Ensures enemy sprite stays on top of the terrain as the hit animation goes downwards
+
+    def check_collision(self, player_rect):
+        """Check if enemy collides with the player."""
+        return self.rect.colliderect(player_rect)
+
+    def sprite(self, alpha=1.0):
+        """(image, world x, y) to draw part way between the last two simulation steps, or None if hidden."""
+        if self.is_visible and not self.in_lava:  # Don't draw the enemy if it's colliding with lava
+            rect = self.rect
+            previous = self.previous_position
+            x = interpolate(previous[0], rect.x, alpha)
+            y = interpolate(previous[1], rect.y, alpha)
+            return self.image, x, y
+        return None
+
+    def draw(self, screen, camera_x, alpha=1.0):
+        sprite = self.sprite(alpha)
+        if sprite:
+            image, x, y = sprite
+            screen.blit(image, (x - camera_x, y))
@@ -0,0 +1,76 @@
+import pygame
+import os
+import time
+from subsystems import subsystems
+from startupTrace import startup_trace
+
+FONT_FAMILY = "JetBrains Mono"
+FONT_DIRECTORY = "./assets/Fonts"  # Optional bundled fonts, e.g. JetBrainsMono-Bold.ttf, used before any system font
+
+# Finds each font family once and keeps every size that gets asked for
+class FontRegistry:
+    def __init__(self):
+        self.__paths = {}  # (family, bold) -> font file, or None for pygame's default font
+        self.__fonts = {}  # (family, size, bold) -> Font
+        self.hits = 0
+        self.misses = 0
+        self.lookup_ns = 0  # Time spent finding font files
+        self.load_ns = 0  # Time spent opening fonts
+
+    def get(self, size, bold=False, family=FONT_FAMILY):
+        """Return a Font for the family, size and weight, creating it the first time it's needed."""
+        key = (family, size, bold)
+        font = self.__fonts.get(key)
+        if font is not None:
+            self.hits += 1
+            return font
+
+        self.misses += 1
+        path = self.__resolve(family, bold)
+        subsystems.require("font")
+        start = time.perf_counter_ns()
+        with startup_trace.span("asset", f"font {family} {size}{' bold' if bold else ''}"):
+            font = pygame.font.Font(path, size)
+        if bold and (path is None or not self.__is_bold_file(path)):
+            font.set_bold(True)  # No bold font file, so let pygame embolden it like SysFont does
+        self.load_ns += time.perf_counter_ns() - start
+        self.__fonts[key] = font
+        return font
+
+    def __resolve(self, family, bold):
+        """Find the font file for a family, preferring a bundled one over the system fonts."""
+        if (family, bold) in self.__paths:
+            return self.__paths[(family, bold)]
+
+        start = time.perf_counter_ns()
+        path = self.__bundled_font(family, bold)
+        if path is None:
+            path = pygame.font.match_font(family, bold=bold)  # None if it isn't installed
+        self.lookup_ns += time.perf_counter_ns() - start
+        self.__paths[(family, bold)] = path
+        return path
+
+    def __bundled_font(self, family, bold):
+        name = family.replace(" ", "")
+        candidates = [f"{name}-Bold.ttf", f"{name}.ttf"] if bold else [f"{name}-Regular.ttf", f"{name}.ttf"]
+        for candidate in candidates:
+            path = os.path.join(FONT_DIRECTORY, candidate)
+            if os.path.isfile(path):
+                return path
+        return None
+
+    def __is_bold_file(self, path):
+        return "bold" in os.path.basename(path).lower()
+
+    def stats(self):
+        """Return the cache counters and lookup times for debugging and benchmarks."""
+        return {
+            "fonts": len(self.__fonts),
+            "hits": self.hits,
+            "misses": self.misses,
+            "lookup_ms": self.lookup_ns / 1_000_000,
+            "load_ms": self.load_ns / 1_000_000,
+        }
+
+# One registry for the whole game
+fonts = FontRegistry()
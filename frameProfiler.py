@@ -0,0 +1,167 @@
+import pygame
+import time
+import csv
+import atexit
+from collections import deque
+from variables import FPS
+from fontRegistry import fonts
+
+# Opt-in timing of each phase of a frame. When it's not enabled every call returns straight away.
+class FrameProfiler:
+    def __init__(self, history=600):
+        self.enabled = False
+        self.overlay = False
+        self.csv_path = None
+        self.budget_ns = 1_000_000_000 // FPS  # Time a frame has before it misses 60 FPS
+        self.history = history  # Frames kept for the rolling statistics
+        self.frame_times = deque(maxlen=history)  # Nanoseconds per frame
+        self.phase_times = {}  # Phase name -> deque of nanoseconds per frame, in the order phases first ran
+        self.counts = {}  # Counter name -> deque of its value each frame, like draw calls
+        self.rows = []  # Every frame's timings for the CSV file
+        self.frame_count = 0
+        self.current = {}  # Phase timings for the frame being measured
+        self.current_counts = {}
+        self.frame_start = 0
+        self.last_mark = 0
+        self.font = None
+        self.overlay_surface = None
+
+    def enable(self, overlay=False, csv_path=None):
+        """Turn on timing, with an optional on-screen overlay and a CSV file written when the game exits."""
+        self.enabled = True
+        self.overlay = overlay
+        self.csv_path = csv_path
+        if csv_path:
+            atexit.register(self.dump_csv)
+
+    def start_frame(self):
+        if not self.enabled:
+            return
+        self.frame_start = self.last_mark = time.perf_counter_ns()
+        self.current = {}
+        self.current_counts = {}
+
+    def mark(self, phase):
+        """Count the time since the last mark as part of this phase."""
+        if not self.enabled:
+            return
+        now = time.perf_counter_ns()
+        self.current[phase] = self.current.get(phase, 0) + now - self.last_mark
+        self.last_mark = now
+
+    def count(self, name, value):
+        """Record a number for this frame, like how many draw calls it made."""
+        if not self.enabled:
+            return
+        self.current_counts[name] = value
+
+    def end_frame(self):
+        if not self.enabled:
+            return
+        total = time.perf_counter_ns() - self.frame_start
+        self.frame_times.append(total)
+        for phase in self.current:
+            if phase not in self.phase_times:
+                # Pad new phases with zeros so every deque lines up with frame_times
+                self.phase_times[phase] = deque([0] * (len(self.frame_times) - 1), maxlen=self.history)
+        for phase, times in self.phase_times.items():
+            times.append(self.current.get(phase, 0))  # Phases that didn't run this frame count as 0
+        for name in self.current_counts:
+            if name not in self.counts:
+                self.counts[name] = deque([0] * (len(self.frame_times) - 1), maxlen=self.history)
+        for name, values in self.counts.items():
+            values.append(self.current_counts.get(name, 0))
+        if self.csv_path:
+            self.rows.append((total, self.current, self.current_counts))
+        self.frame_count += 1
+
+    def summary(self):
+        """Mean and p99 in milliseconds for the whole frame and each phase over the rolling history."""
+        stats = {"frame": self.__stats(self.frame_times)}
+        for phase, times in self.phase_times.items():
+            stats[phase] = self.__stats(times)
+        return stats
+
+    def __stats(self, times):
+        if not times:
+            return {"mean_ms": 0, "p99_ms": 0}
+        ordered = sorted(times)
+        return {
+            "mean_ms": sum(ordered) / len(ordered) / 1_000_000,
+            "p99_ms": ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))] / 1_000_000,
+        }
+
+    def budget_misses(self):
+        """Count the frames in the history that went over budget and which phase was slowest in each."""
+        culprits = {}
+        misses = 0
+        for i, total in enumerate(self.frame_times):
+            if total > self.budget_ns:
+                misses += 1
+                slowest = max(self.phase_times, key=lambda phase: self.phase_times[phase][i])
+                culprits[slowest] = culprits.get(slowest, 0) + 1
+        return misses, culprits
+
+    def print_summary(self):
+        if not self.enabled or not self.frame_times:
+            return
+        for name, stats in self.summary().items():
+            print(f"{name:>20}: mean {stats['mean_ms']:7.3f} ms, p99 {stats['p99_ms']:7.3f} ms")
+        misses, culprits = self.budget_misses()
+        print(f"{misses} of the last {len(self.frame_times)} frames went over {self.budget_ns / 1_000_000:.1f} ms")
+        for phase, count in sorted(culprits.items(), key=lambda item: -item[1]):
+            print(f"{phase:>20}: slowest phase in {count} of them")
+        for name, values in self.counts.items():
+            print(f"{name:>20}: mean {sum(values) / len(values):7.1f} per frame, max {max(values)}")
+
+    def draw_overlay(self, screen):
+        """Draw the frame time, p99 and a bar per phase. Only rebuilt every half second to keep it cheap."""
+        if not self.enabled or not self.overlay or not self.frame_times:
+            return
+        if self.overlay_surface is None or self.frame_count % (FPS // 2) == 0:
+            self.overlay_surface = self.__build_overlay()
+        screen.blit(self.overlay_surface, (20, 60))
+
+    def __build_overlay(self):
+        if self.font is None:
+            self.font = fonts.get(12)
+        stats = self.summary()
+        line_height = 14
+        bar_width = 150  # Pixels for a whole frame's budget
+        budget_ms = self.budget_ns / 1_000_000
+        surface = pygame.Surface((320, line_height * (len(stats) + len(self.counts) + 1) + 8), pygame.SRCALPHA)
+        surface.fill((0, 0, 0, 160))
+
+        frame = stats.pop("frame")
+        text = f"frame {self.frame_times[-1] / 1_000_000:.2f} ms  mean {frame['mean_ms']:.2f}  p99 {frame['p99_ms']:.2f}"
+        surface.blit(self.font.render(text, True, (255, 255, 255)), (4, 4))
+        for i, (phase, phase_stats) in enumerate(stats.items()):
+            y = 4 + line_height * (i + 1)
+            surface.blit(self.font.render(phase, True, (255, 255, 255)), (4, y))
+            width = max(1, int(bar_width * min(1, phase_stats["mean_ms"] / budget_ms)))
+            colour = (255, 80, 80) if phase_stats["p99_ms"] > budget_ms / 4 else (80, 255, 80)
+            pygame.draw.rect(surface, colour, (160, y + 3, width, line_height - 6))
+        for i, (name, values) in enumerate(self.counts.items()):
+            y = 4 + line_height * (len(stats) + i + 1)
+            surface.blit(self.font.render(f"{name} {values[-1]}", True, (255, 255, 255)), (4, y))
+        return surface
+
+    def dump_csv(self):
+        """Write one row per frame with the total and each phase in milliseconds, then each counter."""
+        if not self.rows:
+            return
+        try:
+            with open(self.csv_path, "w", newline="") as f:
+                writer = csv.writer(f)
+                phases = list(self.phase_times)
+                names = list(self.counts)
+                writer.writerow(["frame", "total_ms"] + phases + names)
+                for frame, (total, timings, counts) in enumerate(self.rows):
+                    writer.writerow([frame, total / 1_000_000] + [timings.get(phase, 0) / 1_000_000 for phase in phases]
+                                    + [counts.get(name, 0) for name in names])
+            print(f"Saved frame timings to {self.csv_path}")
+        except OSError as e:
+            print(f"Error saving frame timings: {e}")
+
+# One profiler for the whole game
+frame_profiler = FrameProfiler()
@@ -1,8 +1,11 @@
 import pygame
-import time
 import random
 import os
 from variables import WIDTH
+from assetManager import assets
+from gameClock import game_clock
+
+COLLECTED_SHEET = "./assets/Fruits/Other/Collected.png"
 
 class Fruit:
     def __init__(self, fruit_folder, frame_count, frame_width, frame_height):
@@ -11,7 +14,7 @@ class Fruit:
             self.fruit_sheets = [os.path.join(fruit_folder, f) for f in os.listdir(fruit_folder) if f.endswith('.png')]
 
             # Load collected animation
-            self.__load_collected_animation("./assets/Fruits/Other/Collected.png", 6, 32, 32)  # Update frame count & size
+            self.__load_collected_animation(COLLECTED_SHEET, 6, 32, 32)  # Update frame count & size
 
             # Pick a random fruit sprite sheet
             self.__load_random_fruit(frame_count, frame_width, frame_height)
@@ -19,10 +22,10 @@ class Fruit:
             # Animation & state variables
             self.current_frame = 0
             self.animation_speed = 0.1  # Seconds per frame
-            self.last_animation_time = time.time()
+            self.last_animation_time = game_clock.time()
 
             self.fruit_position = None  # Store fruit position as (x, y)
-            self.last_spawn_time = time.time()
+            self.last_spawn_time = game_clock.time()
             self.spawn_delay = 3  # Time in seconds before a new fruit can spawn
 
             self.collected = False  # Track if fruit is collected
@@ -30,10 +33,15 @@ class Fruit:
         except Exception as e:
             print(f"Error in setting up the fruit. Error: {e}")
 
+    @staticmethod
+    def asset_keys(fruit_folder, frame_width, frame_height):
+        """load_frames arguments for every fruit sheet and the collected animation, so they can be preloaded."""
+        sheets = [os.path.join(fruit_folder, f) for f in os.listdir(fruit_folder) if f.endswith('.png')]
+        return [(path, frame_width, frame_height, 2, "alpha") for path in sheets + [COLLECTED_SHEET]]
+
     def __load_random_fruit(self, frame_count, frame_width, frame_height):
         """Load a random fruit sprite sheet and extract frames."""
         sprite_sheet_path = random.choice(self.fruit_sheets)
-        self.sprite_sheet = pygame.image.load(sprite_sheet_path).convert_alpha()
 
         # Define scaling factor
         scale_factor = 2
@@ -41,49 +49,55 @@ class Fruit:
         self.fruit_height = frame_height * scale_factor
 
         # Extract and scale frames
-        self.frames = [
-            pygame.transform.scale(
-                self.sprite_sheet.subsurface((i * frame_width, 0, frame_width, frame_height)),
-                (self.fruit_width, self.fruit_height)
-            )
-            for i in range(frame_count)
-        ]
+        self.frames = assets.load_frames(sprite_sheet_path, frame_width, frame_height, scale=scale_factor)[:frame_count]
 
     def __load_collected_animation(self, path, frame_count, frame_width, frame_height):
         """Loads the animation frames for when a fruit is collected."""
-        self.collected_sprite_sheet = pygame.image.load(path).convert_alpha()
-        self.collected_frames = [
-            pygame.transform.scale(
-                self.collected_sprite_sheet.subsurface((i * frame_width, 0, frame_width, frame_height)),
-                (frame_width * 2, frame_height * 2)
-            ) for i in range(frame_count)
-        ]
+        self.collected_frames = assets.load_frames(path, frame_width, frame_height, scale=2)[:frame_count]
 
     def spawn_fruit(self, terrain_height, camera_x):
-        """Spawns a fruit if the spawn delay has passed and there isn't one already."""
-        current_time = time.time()
+        """Spawns a fruit if the spawn delay has passed and there isn't one already. Returns True if it spawned."""
+        current_time = game_clock.time()
         if current_time - self.last_spawn_time >= self.spawn_delay and self.fruit_position is None:
             x_position = camera_x + WIDTH + random.randint(50, 200)
             y_position = terrain_height - self.fruit_height + random.randint(-200, 10)
             self.fruit_position = (x_position, y_position)
             self.last_spawn_time = current_time
             self.__load_random_fruit(len(self.frames), self.fruit_width // 2, self.fruit_height // 2)
+            return True
+        return False
+
+    def despawn(self):
+        """Remove the fruit without collecting it, so a new one can spawn."""
+        self.fruit_position = None
+        self.collected = False
+        self.current_frame = 0
+
+    @property
+    def rect(self):
+        """Hit box of the fruit, None if there's no fruit to collect."""
+        if self.fruit_position and not self.collected:
+            return pygame.Rect(self.fruit_position[0], self.fruit_position[1], self.fruit_width, self.fruit_height)
+        return None
+
+    def collect(self):
+        """Start the collection animation."""
+        self.collected = True  # Mark as collected
+        self.collection_start_time = game_clock.time()
+        self.current_frame = 0  # Reset animation
 
     def check_collision(self, player_rect):
         """Triggers collection animation if the player touches the fruit."""
-        if self.fruit_position and not self.collected:
-            fruit_rect = pygame.Rect(self.fruit_position[0], self.fruit_position[1], self.fruit_width, self.fruit_height)
-            if player_rect.colliderect(fruit_rect):
-                self.collected = True  # Mark as collected
-                self.collection_start_time = time.time()
-                self.current_frame = 0  # Reset animation
-                return True  
+        rect = self.rect
+        if rect and player_rect.colliderect(rect):
+            self.collect()
+            return True  
         return False
 
     def update(self, terrain_height, camera_x):
-        """Handles normal fruit animation & collected animation when needed."""
+        """Handles normal fruit animation & collected animation when needed. Returns True if a new fruit spawned."""
         if self.collected:
-            current_time = time.time()
+            current_time = game_clock.time()
             if current_time - self.last_animation_time > self.animation_speed:
                 self.current_frame += 1
                 self.last_animation_time = current_time
@@ -93,22 +107,30 @@ class Fruit:
                     self.fruit_position = None
                     self.collected = False
                     self.current_frame = 0
-            return  
+            return False
         
-        self.spawn_fruit(terrain_height, camera_x)
+        spawned = self.spawn_fruit(terrain_height, camera_x)
         
         if self.fruit_position:
-            current_time = time.time()
+            current_time = game_clock.time()
             if current_time - self.last_animation_time > self.animation_speed:
                 self.current_frame = (self.current_frame + 1) % len(self.frames)
                 self.last_animation_time = current_time
+        return spawned
 
-    def draw(self, screen, camera_x):
-        """Draws the normal fruit or the collected animation if triggered."""
+    def sprite(self):
+        """(image, world x, y) of the fruit or its collected animation, or None if there's no fruit."""
         if self.fruit_position:
             if self.collected:
                 frame = self.collected_frames[min(self.current_frame, len(self.collected_frames) - 1)]
             else:
                 frame = self.frames[self.current_frame]
-            
-            screen.blit(frame, (self.fruit_position[0] - camera_x, self.fruit_position[1]))
\ No newline at end of file
+            return frame, self.fruit_position[0], self.fruit_position[1]
+        return None
+
+    def draw(self, screen, camera_x):
+        """Draws the normal fruit or the collected animation if triggered."""
+        sprite = self.sprite()
+        if sprite:
+            frame, x, y = sprite
+            screen.blit(frame, (x - camera_x, y))
\ No newline at end of file
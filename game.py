@@ -1,51 +1,104 @@
+import os
+import sys
+
+# SDL reads the driver names when pygame starts up, so headless runs and replays have to set them before the imports below
+if __name__ == "__main__" and ("--headless" in sys.argv or any(arg.startswith("--replay") for arg in sys.argv)):
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+from startupTrace import startup_trace
+if __name__ == "__main__" and any(arg.startswith("--trace-startup") for arg in sys.argv):
+    startup_trace.enable()  # Imports are only timed if tracing starts before them
+
 import pygame
 import time
 import random
-from gameMusic import Effects
-from database import Database
-from character import Character
-from variables import WIDTH,HEIGHT,FPS,BG_COLOR,BIG_FONT_COLOR,BIG_FONT_SIZE
+import argparse
+import runpy
+from gameMusic import effects, Music
+from assetManager import assets
+from subsystems import subsystems
+from database import repository
+from character import Character, character_paths
+from variables import WIDTH,HEIGHT,MAX_RENDER_FPS,BG_COLOR
+from gameClock import game_clock, interpolate, STEP_MS
+from frameProfiler import frame_profiler
 from lava import Lava
 from gameOver import GameOver
 from enemies import generate_random_enemy
 from fruits import Fruit
 from traps import generate_random_trap
-from functools import lru_cache
-
-# Initialize pygame and music
-pygame.init()
-effects = Effects()
+from objectPool import pools
+from replay import Recording, decode_keys
+import entityStore
+from collisionWorld import CollisionWorld, PLAYER, ENEMY, TRAP, FRUIT, LAVA
+from hud import Hud
+from fontRegistry import fonts
+from renderQueue import RenderQueue
+from scrollingBackground import ScrollingBackground, ScrollingLayer
+from world import World
+from sceneManager import Scene
+
+BACKGROUND_IMAGE = "./assets/Background/2.jpg"
+TERRAIN_IMAGE = "./assets/Background/blue.png"
+LAVA_DIRECTORY = "./assets/Lava"
+FRUIT_DIRECTORY = "./assets/Fruits/"
+
+def level_assets(character=None):
+    """load_frames arguments for every image startgame loads, so they can be preloaded before the game opens."""
+    character = character or repository.getCharacter()
+    return (
+        Character.asset_keys(character_paths(character))
+        + [(BACKGROUND_IMAGE, None, None, 1, "opaque"), (TERRAIN_IMAGE, None, None, 1, "opaque")]
+        + Lava.asset_keys(LAVA_DIRECTORY)
+        + Fruit.asset_keys(FRUIT_DIRECTORY, 32, 32)
+        + Hud.asset_keys()
+    )
 
 # Play class
-class Play:
-    def __init__(self,menu,music):
-        self.menu = menu
-        self.clock = pygame.time.Clock()
+class Play(Scene):
+    fps = MAX_RENDER_FPS  # The game logic always steps at FPS, drawing can go faster
+
+    def __init__(self,music,headless=False,input_source=None,enemy_store=False,record_path=None):
+        self.use_enemy_store = enemy_store  # Move enemies with NumPy arrays instead of one at a time
+        self.record_path = record_path  # Save a replay of every game played here, see replay.py
+        self.recording = None
+        self.recordings_saved = 0
+        self.headless = headless  # Headless games stop at game over instead of opening the game over screen
+        self.get_keys = input_source or pygame.key.get_pressed  # Anything that returns the held keys like get_pressed
         self.screen = pygame.display.set_mode((WIDTH, HEIGHT))
         pygame.display.set_caption("Play")
-        # Music
+        # Music and sound effects
+        effects.start()
         self.music = music
         self.music.play_music("play")
         self.startgame()
 
     # Load the selected character from file
     def startgame(self):
-        with Database() as db:
-            selected_character = db.getCharacter()
-
-        # Define the paths to the character's sprite sheets for different actions
-        action_paths = {
-            "idle": f"./assets/MainCharacters/{selected_character}/idle.png",  # Path to idle sprite sheet
-            "run": f"./assets/MainCharacters/{selected_character}/run.png",  # Path to run sprite sheet
-            "jump": f"./assets/MainCharacters/{selected_character}/jump.png",  # Path to jump sprite sheet
-            "double_jump": f"./assets/MainCharacters/{selected_character}/double_jump.png"  # Path to double jump sprite sheet
-        }
-        self.player = Character(action_paths)
-        self.background_image = self.load_background("./assets/Background/2.jpg")
-        self.terrain_image = self.load_background("./assets/Background/blue.png")
-        self.terrain_tiles = []
-        self.init_terrain()
+        self.save_recording()  # The last game, if it was quit without reaching game over
+        if self.record_path:
+            # Seed before anything random happens, so the seed and the keys are enough to play the game again
+            seed = random.getrandbits(32)
+            random.seed(seed)
+            self.recording = Recording(seed, repository.getNumberofEnemies(), self.use_enemy_store, game_clock.now())
+        self.release_entities()  # Hand back anything left from the last game when restarting
+        selected_character = repository.getCharacter()
+
+        # The character's sprite sheets for each action (idle, run, jump and double jump)
+        self.player = Character(character_paths(selected_character))
+        self.background_image = self.load_background(BACKGROUND_IMAGE)
+        self.terrain_image = self.load_background(TERRAIN_IMAGE)
+        # Pre-tiled strips for the background and terrain, more (image, parallax) layers can be added from assets/Background
+        self.background = ScrollingBackground([
+            ScrollingLayer(self.background_image, height=HEIGHT, parallax=1.0),
+        ])
+        self.terrain = ScrollingLayer(self.terrain_image, y=HEIGHT - self.terrain_image.get_height())
+        self.world = World(self.release_trap)  # Traps and fruit, streamed in chunks around the camera
         self.camera_x = 0
+        # Camera and player position at the last simulation step, so drawing can blend between steps
+        self.previous_camera_x = 0
+        self.previous_player_position = list(self.player.position)
         self.gravity = 0.5
         self.velocity_y = 0
         self.on_ground = False
@@ -63,50 +116,36 @@ class Play:
         # Health System
         self.max_health = 100
         self.current_health = 100  # Player starts with full health
+        self.hud = Hud()
+        self.render_queue = RenderQueue()
         self.immunity = False
         # Lava
-        self.lava = Lava(frames_directory="./assets/Lava",terrain_height=self.terrain_image.get_height())
+        self.lava = Lava(frames_directory=LAVA_DIRECTORY,terrain_height=self.terrain_image.get_height())
         self.last_damage_time = 0  # Track last time the player took lava damage
         self.lava_damage = 20
         self.damage_interval = 0.8  # Seconds before taking damage again
         # Enemies
         self.enemies = []
+        # Every enemy's state in NumPy arrays, so they all move in one step, with views in self.enemies
+        self.enemy_store = entityStore.EnemyStore(seed=random.getrandbits(32)) if self.use_enemy_store else None
         self.spawn_timer = 0  # Timer to control enemy spawning
         self.spawn_interval = 3000  # Time in milliseconds between spawns
         self.last_collision_time = 0
         self.collision_delay = 1000  # 1 second delay
         # Fruit
-        self.fruit_system = Fruit("./assets/Fruits/", frame_count=14, frame_width=32, frame_height=32)
+        self.fruit_system = Fruit(FRUIT_DIRECTORY, frame_count=14, frame_width=32, frame_height=32)
         # Traps
         self.last_trap_hit_time = 0  # Track last time the player hit a trap
         self.trap_hit_cooldown = 1.0  # 1 second cooldown before taking damage again
         # Traps
         self.trap_spawn_timer = 0  # Timer to control trap spawning
         self.trap_spawn_interval = 8000  # Time in milliseconds between trap spawns
-        self.traps = []  # List to hold active traps
-
-    def draw_health_bar(self):
-        """Draws hearts in the top-right corner to represent health."""
-        heart_sheet = pygame.image.load("./assets/Health/heart.png").convert_alpha()  # Load the heart sprite sheet
-        heart_full = heart_sheet.subsurface((0, 0, 32, 32))  # Full heart image
-        heart_half = heart_sheet.subsurface((32, 0, 32, 32))  # Half heart image
-        heart_empty = heart_sheet.subsurface((64, 0, 32, 32))  # Empty heart image
-        
-        heart_size = 32  # Adjust heart size
-        spacing = 3  # Space between hearts
-        max_hearts = 5  # Total hearts available
-        hearts_to_display = self.current_health // 20  # 20 HP per heart
-
-        for i in range(max_hearts):
-            x = WIDTH - (heart_size + spacing) * (max_hearts - i) - 20
-            y = 20  # Align at the top
-
-            if i < hearts_to_display:
-                self.screen.blit(pygame.transform.scale(heart_full, (heart_size, heart_size)), (x, y))
-            elif i == hearts_to_display and self.current_health % 20 != 0:
-                self.screen.blit(pygame.transform.scale(heart_half, (heart_size, heart_size)), (x, y))
-            else:
-                self.screen.blit(pygame.transform.scale(heart_empty, (heart_size, heart_size)), (x, y))
+        # Collisions: everything that can touch is registered once and checked together each step
+        self.collision_world = CollisionWorld()
+        self.collision_world.add(self.player, PLAYER, ENEMY | TRAP | FRUIT | LAVA, (self.lava.tile_width, self.lava.tile_height))
+        self.collision_world.add(self.fruit_system, FRUIT)
+        self.collision_world.add_field(self.lava, LAVA)
+        self.game_over = False
 
     def take_damage(self, amount):
         """Reduces health and triggers red flash effect"""
@@ -119,11 +158,14 @@ class Play:
             self.current_health = max(0, self.current_health - amount)
             self.speed = 6
             self.player.take_damage_effect()  # Activate red highlight
-        if self.current_health <= 0:
-            game_over_screen = GameOver(self.menu,self,self.score)
+        if self.current_health <= 0 and not self.game_over:
+            self.game_over = True  # Stops the simulation, headless games end here
+            self.save_recording()
+            if self.headless:
+                return
             effects.kill_effects()
             self.music.play_music("menu")
-            game_over_screen.run()
+            self.manager.push(GameOver(self, self.score))
     
     def add_health(self, amount, fruit="yes"):
         if self.current_health >= 100:
@@ -145,20 +187,11 @@ class Play:
 
     def load_background(self, image_path):
         try:
-            return pygame.image.load(image_path).convert()
+            return assets.load_image(image_path, pixel_format="opaque")  # Cached, so restarting or preloading doesn't decode it again
         except FileNotFoundError:
             print("Background image file not found")
             exit()
     
-    def init_terrain(self):
-        for i in range(WIDTH // self.terrain_image.get_width() + 1):
-            self.terrain_tiles.append(i * self.terrain_image.get_width())
-
-    def generate_terrain(self):
-        last_tile = self.terrain_tiles[-1]
-        if last_tile < self.camera_x + WIDTH:
-            self.terrain_tiles.append(last_tile + self.terrain_image.get_width())
-
     def apply_gravity(self):
         self.velocity_y += self.gravity
         self.player.position[1] += self.velocity_y
@@ -173,8 +206,10 @@ class Play:
             self.on_ground = False
 
     def handle_input(self):
-        keys = pygame.key.get_pressed()
-        current_time = time.time()
+        keys = self.get_keys()
+        if self.recording is not None:
+            self.recording.record(keys)
+        current_time = game_clock.time()
 
         # Store the current position before moving
         current_position_x = self.player.position[0]
@@ -209,180 +244,428 @@ class Play:
                     self.player.set_action("double_jump")
                 self.last_jump_time = current_time
         
-        if keys[pygame.K_q]:
-            self.menu.run()
+        if keys[pygame.K_q] and self.manager and not self.manager.changing:
+            self.manager.pop()  # Back to the menu once this step is done
             effects.kill_effects()
 
         self.player.position[0] = max(0, self.player.position[0])
     
-    def draw_distance_counter(self):
-        font = pygame.font.SysFont("JetBrains Mono", 25, bold=True)  # You can adjust the font size
-        distance_text = f"Score: {int(self.score)}"  # Format to 2 decimal places
-        text_surface = font.render(distance_text, True, (255, 255, 255))  # White color
-        self.screen.blit(text_surface, (20, 20))  # Position it at the top-left corner
-    
     def damage_jump(self, current_time):
         self.velocity_y = self.first_jump_strength
         self.jump_count = 2
         self.player.set_action("jump")
         self.last_jump_time = current_time
 
-    def check_lava_collision(self):
-        """Check if the player collides with the lava and apply damage with a cooldown."""
-        player_rect = pygame.Rect(self.player.position[0], self.player.position[1], 64, 64)
-
-        for tile in self.lava.tiles:
-            lava_rect = pygame.Rect(tile[0], tile[1], self.lava.tile_width, self.lava.tile_height)
-            if player_rect.colliderect(lava_rect):
-                current_time = time.time()
-                if current_time - self.last_damage_time > self.damage_interval:
-                    self.take_damage(self.lava_damage)
-                    self.damage_jump(current_time)
-                    self.last_damage_time = current_time  # Reset cooldown timer
-                    self.speed = 7
-                break
-
-    def draw_fruits(self):
-        for fruit in self.fruit.fruits:
-            fruit_image = pygame.image.load(fruit[0]).convert_alpha()  # Load the fruit image
-            self.screen.blit(fruit_image, (fruit[1] - self.camera_x, fruit[2]))  # Draw the fruit
-        
-    def draw(self):
+    def lava_contact(self):
+        """The player is touching the lava, apply damage with a cooldown."""
+        current_time = game_clock.time()
+        if current_time - self.last_damage_time > self.damage_interval:
+            self.take_damage(self.lava_damage)
+            self.damage_jump(current_time)
+            self.last_damage_time = current_time  # Reset cooldown timer
+            self.speed = 7
+
+    def enemy_contact(self, enemy, player_rect):
+        """The player is touching an enemy, stomp on it from above or take damage."""
+        current_time = game_clock.get_ticks()
+
+        # Check if the collision is from above
+        if (player_rect.bottom > enemy.rect.top and player_rect.top < enemy.rect.top) and self.velocity_y > 0:
+            if not enemy.is_hit:
+                enemy.take_damage()
+            self.damage_jump(game_clock.time())
+            self.speed = 7
+            self.last_collision_time = current_time
+        else:
+            if current_time - self.last_collision_time > self.collision_delay:
+                self.take_damage(repository.getDamageEnemy(enemy.type))  # Take damage if there is a collision
+                self.damage_jump(game_clock.time())
+                self.last_collision_time = current_time  # Reset collision timer
+
+    def trap_contact(self, trap):
+        """The player is touching a trap, apply its damage with a cooldown."""
+        current_time = game_clock.time()
+        if current_time - self.last_trap_hit_time > self.trap_hit_cooldown:
+            self.take_damage(repository.getDamageTrap(trap.type))
+            self.damage_jump(current_time)
+            self.last_trap_hit_time = current_time
+
+    def handle_collisions(self):
+        """Find every contact this step in one pass and act on them, lava first, then fruit, enemies and traps."""
+        player_rect = self.player.rect
+        touching = {LAVA: [], FRUIT: [], ENEMY: [], TRAP: []}  # Layer -> things touching the player
+        for enemy in self.enemies:
+            enemy.in_lava = False
+        for a, b in self.collision_world.step():
+            if a.layer == PLAYER:
+                touching[b.layer].append(b.owner)
+            elif a.layer == ENEMY and b.layer == LAVA:
+                a.owner.in_lava = True
+                effects.play_effect("bbq")
+
+        if touching[LAVA]:
+            self.lava_contact()
+        if touching[FRUIT]:
+            self.fruit_system.collect()
+            self.add_health(10,fruit="yes")
+        for enemy in touching[ENEMY]:
+            self.enemy_contact(enemy, player_rect)
+        for trap in touching[TRAP]:
+            self.trap_contact(trap)
+
+    def draw_background(self, camera_x):
+        """Draw every background layer, one blit each."""
+        self.background.draw(self.screen, camera_x)
+
+    def draw_terrain(self, camera_x):
+        self.terrain.draw(self.screen, camera_x)
+
+    def draw(self, alpha=1.0):
+        """Draw the game part way between the last two simulation steps, alpha being how far along.
+
+        Every layer is queued at its world position, then the whole frame is drawn in a couple of blits calls.
+        """
         self.screen.fill(BG_COLOR)
-    
-        # Draw the background
-        background_width = self.background_image.get_width()
-        background_height = self.background_image.get_height()
-        for x in range(self.camera_x // background_width, (self.camera_x + WIDTH) // background_width + 1):
-            for y in range(HEIGHT // background_height + 1):  # Tile vertically across the screen
-                self.screen.blit(self.background_image, (x * background_width - self.camera_x, y * background_height))
-    
-        # Draw the terrain
-        for x in self.terrain_tiles:
-            self.screen.blit(self.terrain_image, (x - self.camera_x, HEIGHT - self.terrain_image.get_height()))
-    
-        # Draw the player
-        self.player.update()
-        self.player.draw(self.screen, (self.player.position[0] - self.camera_x, self.player.position[1]))
-
-        # Draw lava
-        self.lava.draw(self.screen, self.camera_x)
-
-        # Draw the health bar
-        self.draw_health_bar()
-
-        # Draw the distance counter
-        self.draw_distance_counter()
-
-        # Draws the fruit on the screen
-        self.fruit_system.draw(self.screen, self.camera_x)
-
-        # Enemy
-        # Draw all enemies
+        camera_x = interpolate(self.previous_camera_x, self.camera_x, alpha)
+        queue = self.render_queue
+
+        for strip, x, y, area in self.background.sprites(camera_x):
+            queue.add("background", strip, x, y, area)
+        frame_profiler.mark("draw_background")
+        queue.add("terrain", *self.terrain.sprite(camera_x))
+        frame_profiler.mark("draw_terrain")
+
+        # Queue the player
+        player_x = interpolate(self.previous_player_position[0], self.player.position[0], alpha)
+        player_y = interpolate(self.previous_player_position[1], self.player.position[1], alpha)
+        queue.add("player", self.player.image, player_x, player_y)
+        frame_profiler.mark("draw_player")
+
+        # Queue the fruit
+        sprite = self.fruit_system.sprite()
+        if sprite:
+            queue.add("fruit", *sprite)
+        frame_profiler.mark("draw_fruit")
+
+        # Queue all enemies
         for enemy in self.enemies:
-            enemy.draw(self.screen, self.camera_x, self.lava.tiles)
-
-        # Traps
-        # Draw traps
-        # Draw traps
-        for trap in self.traps:
-            trap.draw(self.screen, self.camera_x)
+            sprite = enemy.sprite(alpha)
+            if sprite:
+                queue.add("enemies", *sprite)
+        frame_profiler.mark("draw_enemies")
+
+        # Queue traps
+        for trap in self.world.get_traps():
+            sprite = trap.sprite()
+            if sprite:
+                queue.add("traps", *sprite)
+        frame_profiler.mark("draw_traps")
+
+        # Lava goes on top of everything it flows over
+        queue.extend("lava", *self.lava.sprites(camera_x, round(self.lava.speed * (1 - alpha))))  # The whole sheet moves by speed each step
+        frame_profiler.mark("draw_lava")
+
+        # The health bar and distance counter
+        queue.add("hud", self.hud.image(self.current_health, self.score), 0, 0)
+        frame_profiler.mark("draw_hud")
+
+        queue.flush(self.screen, camera_x)
+        frame_profiler.mark("draw_submit")
+        frame_profiler.count("draw_calls", queue.draw_calls)
+        frame_profiler.count("sprites", queue.sprites)
+
+    def update(self):
+        """Advance the game by one simulation step without drawing anything."""
+        self.previous_camera_x = self.camera_x
+        self.previous_player_position = list(self.player.position)
+
+        self.handle_input()
+        frame_profiler.mark("input")
+        self.apply_gravity()
+        frame_profiler.mark("gravity")
+
+        # Update camera position
+        self.camera_x = max(0, self.player.position[0] - WIDTH // 2)
+
+        frame_profiler.mark("camera")
+
+        # Update lava
+        self.lava.update(self.camera_x)
+        frame_profiler.mark("lava_update")
+
+        # Stream in the chunks ahead, recycling the ones left behind
+        self.world.update(self.camera_x)  # Recycled chunks give back their traps and despawn their fruit
+        frame_profiler.mark("terrain")
+
+        # Update the player's animation
+        self.player.update()
+        frame_profiler.mark("player_animation")
+
+        # Update enemy postion
+        # Spawn new enemies if needed
+        current_time = game_clock.get_ticks()
+        if (current_time - self.spawn_timer > self.spawn_interval) and len(self.enemies) < 1:
+            new_enemies = generate_random_enemy(self.camera_x)
+            if self.enemy_store is not None:
+                new_enemies = [self.enemy_store.add(enemy) for enemy in new_enemies]
+            for enemy in new_enemies:
+                self.collision_world.add(enemy, ENEMY, LAVA, enemy.tile_hit_size)
+            self.enemies.extend(new_enemies)  # Add new enemies to the list
+            self.spawn_timer = current_time  # Reset the spawn timer
+        frame_profiler.mark("enemy_spawn")
+
+        # Update all enemies
+        if self.enemy_store is not None:
+            self.enemy_store.update(self.camera_x)  # Moves them all at once, so their own update does nothing
+        for enemy in self.enemies[:]:
+            enemy.update(self.camera_x)
+
+            # Check if the enemy is off-screen or finished dying and remove it
+            if enemy.rect.left < self.camera_x or enemy.is_visible == False:
+                self.enemies.remove(enemy)  # Remove the enemy from the list
+                self.release_enemy(enemy)
+        frame_profiler.mark("enemy_update")
+
+        # Fruit updates
+        if self.fruit_system.update(HEIGHT - self.terrain_image.get_height(),self.camera_x):
+            self.world.add_fruit(self.fruit_system)  # The chunk it spawned in owns it from now on
+        frame_profiler.mark("fruit")
+        
+        ## Spawn new traps if needed
+        current_time = game_clock.get_ticks()
+        if (current_time - self.trap_spawn_timer > self.trap_spawn_interval):
+            trap = generate_random_trap()  # Call the method to spawn traps
+            trap.update(HEIGHT - self.terrain_image.get_height(), self.camera_x)  # Places the trap just past the screen
+            self.world.add_trap(trap)  # The chunk it lands in owns it from now on
+            self.collision_world.add(trap, TRAP)
+            self.trap_spawn_timer = current_time  # Reset the spawn timer
+        
+        for trap in self.world.get_traps():
+            # Check if the trap is off-screen and remove it
+            if trap.trap_position[0] < self.camera_x:
+                self.world.remove_trap(trap)  # Remove the trap from its chunk
+                self.release_trap(trap)
+        frame_profiler.mark("traps")
+
+        # Every collision between the player, enemies, traps, fruit and lava
+        self.handle_collisions()
+        frame_profiler.mark("collisions")
+
+        game_clock.tick()
+
+    def release_enemy(self, enemy):
+        """Give an enemy back to its pool, so the next enemy of this type can reuse it."""
+        self.collision_world.remove(enemy)
+        if self.enemy_store is not None:
+            enemy = self.enemy_store.remove(enemy)  # The view's slot is freed and the enemy object comes back
+        pools.release(enemy)
+
+    def release_trap(self, trap):
+        """Take a trap off the map and out of the collision world, then give it back to its pool."""
+        self.collision_world.remove(trap)
+        trap.reset()  # No stale hit box is left on a pooled trap
+        pools.release(trap)
+
+    def release_entities(self):
+        """Return the enemies and traps of the current game to their pools."""
+        for enemy in getattr(self, "enemies", []):
+            self.release_enemy(enemy)
+        self.enemies = []
+        if hasattr(self, "world"):
+            self.world.clear()
 
+    def resume(self):
+        """Start timing from now, so time spent on another screen isn't simulated."""
+        pygame.display.set_caption("Play")
+        self.music.play_music("play")  # Back from the game over screen after playing again
+        self.accumulator = 0
+        self.previous_time = time.perf_counter()
+
+    def frame(self):
+        # Fixed timestep: the game logic runs FPS times a second of real time no matter how fast frames are drawn
+        step = STEP_MS / 1000
+        frame_profiler.start_frame()  # Time spent waiting in the scene manager's tick isn't part of the frame
+
+        now = time.perf_counter()
+        self.accumulator += min(now - self.previous_time, 0.25)  # Don't try to catch up on long stalls like window drags
+        self.previous_time = now
+
+        while self.accumulator >= step and not self.game_over and not self.manager.changing:
+            self.update()
+            self.accumulator -= step
+
+        self.draw(self.accumulator / step)
+        frame_profiler.draw_overlay(self.screen)
+        frame_profiler.mark("overlay")
         pygame.display.flip()
-
-    def run(self):
-        while True:
-            self.clock.tick(FPS)
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-                    exit()
-
-            self.handle_input()
-            self.apply_gravity()
-            self.check_lava_collision()
-
-            # Player position for checking collision
-            player_rect = pygame.Rect(self.player.position[0], self.player.position[1], 64, 64)
-
-            # Update camera position
-            self.camera_x = max(0, self.player.position[0] - WIDTH // 2)
-
-            # Update lava
-            self.lava.update(self.camera_x)
-
-            self.generate_terrain()
-            self.draw()
-
-            # Draw lava
-            self.lava.draw(self.screen, self.camera_x)
-
-            # Update enemy postion
-            # Spawn new enemies if needed
-            current_time = pygame.time.get_ticks()
-            if (current_time - self.spawn_timer > self.spawn_interval) and len(self.enemies) < 1:
-                self.enemies.extend(generate_random_enemy(self.camera_x))  # Add new enemies to the list
-                self.spawn_timer = current_time  # Reset the spawn timer
-
-            # Update all enemies
-            for enemy in self.enemies[:]:
-                enemy.update(self.camera_x)
-
-                # Check if the enemy is off-screen and remove it
-                if enemy.rect.left < self.camera_x: 
-                    self.enemies.remove(enemy)  # Remove the enemy from the list
-                
-                if enemy.is_visible == False:
-                    self.enemies.remove(enemy)
-
-            # Fruit updates and collison detection
-            self.fruit_system.update(HEIGHT - self.terrain_image.get_height(),self.camera_x)            
-            if self.fruit_system.check_collision(player_rect):
-                self.add_health(10,fruit="yes")
-            
-            # Collision detetction with enemy
-            for enemy in self.enemies:
-                if enemy.check_collision(player_rect):
-                    current_time = pygame.time.get_ticks()
-
-                    # Check if the collision is from above
-                    if (player_rect.bottom > enemy.rect.top and player_rect.top < enemy.rect.top) and self.velocity_y > 0:
-                        if not enemy.is_hit:
-                            enemy.take_damage()
-                        self.damage_jump(current_time)
-                        self.speed = 7
-                        self.last_collision_time = current_time
-                    else:
-                        if current_time - self.last_collision_time > self.collision_delay:
-                            with Database() as db:
-                                self.take_damage(db.getDamageEnemy(enemy.type))  # Take damage if there is a collision
-                            self.damage_jump(current_time)
-                            self.last_collision_time = current_time  # Reset collision timer
-            
-            ## Spawn new traps if needed
-            current_time = pygame.time.get_ticks()
-            if (current_time - self.trap_spawn_timer > self.trap_spawn_interval):
-                self.traps.append(generate_random_trap())  # Call the method to spawn traps
-                self.trap_spawn_timer = current_time  # Reset the spawn timer
-            
-            for trap in self.traps[:]:
-                trap.update(HEIGHT - self.terrain_image.get_height(), self.camera_x)
-
-                if trap.trap_position:  # Only create a rect if the trap has been spawned
-                    trap_rect = pygame.Rect(trap.trap_position[0], trap.trap_position[1], trap.trap_width, trap.trap_height)
-
-                    # Check if the trap is off-screen and remove it
-                    if trap_rect.left < self.camera_x: 
-                        self.traps.remove(trap)  # Remove the trap from the list
-
-            # Check for trap collisions
-            current_time = time.time()
-            for trap in self.traps:
-                if trap.check_collision(player_rect):
-                    if current_time - self.last_trap_hit_time > self.trap_hit_cooldown:
-                        with Database() as db:
-                            self.take_damage(db.getDamageTrap(trap.type))
-                        self.damage_jump(current_time)
-                        self.last_trap_hit_time = current_time
-
-            pygame.display.flip()
\ No newline at end of file
+        frame_profiler.mark("flip")
+        frame_profiler.end_frame()
+
+    def save_recording(self):
+        """Save the game being recorded, if there is one. Games after the first are numbered, e.g. run-2.replay."""
+        if self.recording is None:
+            return
+        self.recording.score = self.score
+        self.recording.health = self.current_health
+        path = self.record_path
+        if self.recordings_saved:
+            root, extension = os.path.splitext(path)
+            path = f"{root}-{self.recordings_saved + 1}{extension}"
+        self.recording.save(path)
+        print(f"Saved a replay of {len(self.recording.steps)} steps to {path}")
+        self.recordings_saved += 1
+        self.recording = None
+
+    def release(self):
+        """Save any replay being recorded and hand the enemies and traps back to their pools, then drop everything else."""
+        self.save_recording()
+        self.release_entities()
+        super().release()
+
+# Key names that can be used in headless input scripts
+SCRIPT_KEYS = {
+    "left": pygame.K_LEFT,
+    "right": pygame.K_RIGHT,
+    "jump": pygame.K_SPACE,
+}
+
+class ScriptedInput:
+    """Plays back held keys from a script instead of reading the keyboard.
+
+    Each line of the script is a frame number followed by the keys held from that frame on,
+    for example "120 right jump". Lines starting with # are ignored.
+    """
+    def __init__(self, script_path=None):
+        self.frame = 0
+        self.changes = []  # (frame, held keys) sorted by frame
+        if script_path is None:
+            self.changes.append((0, {pygame.K_RIGHT}))  # Without a script just keep running right
+        else:
+            with open(script_path) as f:
+                for line in f:
+                    parts = line.split("#")[0].split()
+                    if parts:
+                        self.changes.append((int(parts[0]), {SCRIPT_KEYS[key] for key in parts[1:]}))
+            self.changes.sort(key=lambda change: change[0])
+        self.next_change = 0
+        self.held = set()
+
+    def __call__(self):
+        while self.next_change < len(self.changes) and self.changes[self.next_change][0] <= self.frame:
+            self.held = self.changes[self.next_change][1]
+            self.next_change += 1
+        self.frame += 1
+        return KeyState(self.held)
+
+class ReplayInput:
+    """Plays back the keys held at each step of a recorded game, then nothing."""
+    def __init__(self, recording):
+        self.steps = recording.steps
+        self.step = 0
+
+    def __call__(self):
+        mask = self.steps[self.step] if self.step < len(self.steps) else 0
+        self.step += 1
+        return KeyState(decode_keys(mask))
+
+class KeyState:
+    """Looks like the result of pygame.key.get_pressed for a set of held keys."""
+    def __init__(self, held):
+        self.held = held
+
+    def __getitem__(self, key):
+        return key in self.held
+
+def run_headless(frames, seed, script_path=None, render=False, enemy_store=False, record_path=None):
+    """Run the game logic as fast as possible and report how many frames per second it managed."""
+    random.seed(seed)
+    subsystems.require("display")
+    pygame.display.set_mode((WIDTH, HEIGHT))
+    play = Play(Music(), headless=True, input_source=ScriptedInput(script_path), enemy_store=enemy_store, record_path=record_path)
+    run_steps(play, frames, render)
+    play.save_recording()  # Ran out of frames before game over
+    return play
+
+def run_replay(replay_path, render=False):
+    """Play a recorded game back as fast as possible and check it ends the same way. Returns True if it does."""
+    recording = Recording.load(replay_path)
+    random.seed(recording.seed)
+    game_clock.set(recording.start_ms)
+    repository.updateNumberofEnemies(recording.enemy_count)  # Only for this run, headless runs never save settings
+    subsystems.require("display")
+    pygame.display.set_mode((WIDTH, HEIGHT))
+    play = Play(Music(), headless=True, input_source=ReplayInput(recording), enemy_store=recording.enemy_store)
+    run_steps(play, len(recording.steps), render)
+
+    matches = play.score == recording.score and play.current_health == recording.health
+    if matches:
+        print(f"Replay matches the recording: score {recording.score:.2f}, health {recording.health}")
+    else:
+        print(f"Replay differs from the recording: score {play.score:.2f} not {recording.score:.2f}, "
+              f"health {play.current_health} not {recording.health}")
+    return matches
+
+def run_steps(play, frames, render=False):
+    """Step a headless game until game over or it has run for the number of frames, then print how fast it went."""
+    start = time.perf_counter()
+    frames_run = 0
+    while frames_run < frames and not play.game_over:
+        frame_profiler.start_frame()
+        play.update()
+        if render:
+            play.draw()
+            frame_profiler.draw_overlay(play.screen)
+            frame_profiler.mark("overlay")
+        frame_profiler.end_frame()
+        startup_trace.frame_presented()  # Nothing is shown headless, so the first frame ends the trace
+        frames_run += 1
+    elapsed = time.perf_counter() - start
+
+    print(f"Simulated {frames_run} frames in {elapsed:.3f}s ({frames_run / elapsed:.0f} frames per second)")
+    print(f"Score: {int(play.score)}, health: {play.current_health}, game over: {play.game_over}")
+    if render:
+        queue = play.render_queue
+        print(f"Last frame drew {queue.sprites} sprites in {queue.draw_calls} draw calls")
+    frame_profiler.print_summary()
+    for name, stats in pools.stats().items():
+        print(f"Pool {name}: {stats['created']} created, {stats['in_use']} in use, {stats['free']} free, high water {stats['high_water']}")
+    print(f"World: {play.world.streamed} chunks streamed in, {len(play.world.chunks)} in the ring")
+    stats = assets.stats()
+    print(f"Assets: {stats['entries']} cached using {stats['bytes'] // 1024} KB, {stats['hits']} hits, {stats['misses']} misses "
+          f"({stats['atlas_hits']} cut from the atlas), {stats['evictions']} evicted")
+    stats = fonts.stats()
+    print(f"Fonts: {stats['fonts']} loaded, {stats['hits']} hits, {stats['misses']} misses, "
+          f"{stats['lookup_ms']:.1f} ms finding files, {stats['load_ms']:.1f} ms opening them")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the game")
+    parser.add_argument("--headless", action="store_true", help="run without a window or sound, as fast as possible")
+    parser.add_argument("--frames", type=int, default=3600, help="number of frames to simulate when headless, or to show before quitting otherwise")
+    parser.add_argument("--seed", type=int, default=0, help="random seed for enemies, traps and fruit")
+    parser.add_argument("--input", help="input script to play back when headless")
+    parser.add_argument("--render", action="store_true", help="draw every frame to an off-screen window when headless")
+    parser.add_argument("--profile", action="store_true", help="time each phase of every frame")
+    parser.add_argument("--overlay", action="store_true", help="show the frame timings on screen, implies --profile")
+    parser.add_argument("--profile-csv", help="save every frame's timings to this CSV file on exit, implies --profile")
+    parser.add_argument("--enemy-store", action="store_true", help="move enemies with NumPy arrays when headless")
+    parser.add_argument("--record", help="save a replay of every game played to this file, numbering the games after the first")
+    parser.add_argument("--replay", help="play back a replay file headless as fast as possible and check it ends the same way")
+    parser.add_argument("--trace-startup", action="store_true", help="time every import, subsystem and asset load up to the first frame")
+    parser.add_argument("--trace-startup-json", help="save the startup trace to this JSON file, implies --trace-startup")
+    args = parser.parse_args()
+
+    if args.profile or args.overlay or args.profile_csv:
+        frame_profiler.enable(overlay=args.overlay, csv_path=args.profile_csv)
+
+    if args.trace_startup_json:
+        startup_trace.enable(json_path=args.trace_startup_json)
+
+    if args.replay:
+        matches = run_replay(args.replay, args.render)
+        subsystems.quit()
+        sys.exit(0 if matches else 1)
+    elif args.headless:
+        run_headless(args.frames, args.seed, args.input, args.render, args.enemy_store, args.record)
+        subsystems.quit()
+    else:
+        runpy.run_module("main", run_name="__main__")  # Same as running main.py
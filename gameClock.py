@@ -0,0 +1,36 @@
+from variables import FPS
+
+# The game logic always moves forward in steps of this many milliseconds, however fast the screen is drawn
+STEP_MS = 1000 / FPS
+
+# Simulation clock shared by everything in the game, so timers all agree and only move when the game does
+class GameClock:
+    def __init__(self):
+        self.__time = 0.0  # Milliseconds of game time
+
+    def get_ticks(self):
+        """Game time in milliseconds, used in place of pygame.time.get_ticks."""
+        return int(self.__time)
+
+    def time(self):
+        """Game time in seconds, used in place of time.time."""
+        return self.__time / 1000
+
+    def now(self):
+        """Exact game time in milliseconds, for saving it."""
+        return self.__time
+
+    def set(self, milliseconds):
+        """Jump to a saved game time, e.g. where a recorded game started."""
+        self.__time = milliseconds
+
+    def tick(self, milliseconds=STEP_MS):
+        """Move game time forward by one simulation step."""
+        self.__time += milliseconds
+
+def interpolate(previous, current, alpha):
+    """Blend between the last two simulation steps for drawing, rounded to whole pixels."""
+    return round(previous + (current - previous) * alpha)
+
+# One clock for the whole game
+game_clock = GameClock()
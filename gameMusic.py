@@ -1,66 +1,157 @@
 import pygame
+import os
+import io
 import random
-from database import Database
+import threading
+from database import repository
+from settings import Settings
+from gameClock import game_clock
+from subsystems import subsystems
+from startupTrace import startup_trace
 
+CROSSFADE_MS = 600  # How long the old track fades out for before the next one starts
+MUSIC_VOLUME = 0.2
+
+# Background music. Every track is read into memory on a background thread, so switching is a fade
+# out into a queued track that never waits on the disk
 class Music:
     def __init__(self):
         try:
-            pygame.mixer.init()
+            subsystems.require("mixer")
             self.tracks = {
                 "menu": "./assets/Sounds/Music/menu-music.mp3",
                 "play": "./assets/Sounds/Music/play-music.mp3",
             }
+            self.current = None  # Track playing, or queued to play once the last one fades out
+            self.__data = {}  # Track name -> contents of its file, filled in by the reader thread
+            self.__reader = threading.Thread(target=self.__read_tracks, daemon=True)
+            self.__reader.start()
         except Exception as e:
             print(f"Failed to start music. Error: {e}")
             exit()
-    
+
+    def __read_tracks(self):
+        for name, path in self.tracks.items():
+            try:
+                with open(path, "rb") as f:
+                    self.__data[name] = f.read()
+            except OSError as e:
+                print(f"Music track {name} not found. Error: {e}")
+
+    def __source(self, track_name):
+        """The track from memory, or its path if it hasn't been read yet so the mixer streams it instead."""
+        data = self.__data.get(track_name)
+        return io.BytesIO(data) if data is not None else self.tracks[track_name]
+
     def play_music(self, track_name):
-        """Play a specific music track."""
-        if track_name in self.tracks:
-            pygame.mixer.music.stop()  # Stop current music
-            pygame.mixer.music.load(self.tracks[track_name])
-            pygame.mixer.music.set_volume(0.2)
-            pygame.mixer.music.play(-1)  # Loop indefinitely
+        """Switch to a track, fading out the one playing first. Does nothing if it's already the current track."""
+        if track_name not in self.tracks or track_name == self.current:
+            return
+        self.current = track_name
+        source = self.__source(track_name)
+        file_type = os.path.splitext(self.tracks[track_name])[1][1:]  # Tells SDL how to decode the bytes
+        with startup_trace.span("asset", self.tracks[track_name]):
+            if pygame.mixer.music.get_busy():
+                pygame.mixer.music.fadeout(CROSSFADE_MS)  # Clears the queue, so queue the next track after
+                pygame.mixer.music.queue(source, file_type, loops=-1)  # Starts as soon as the fade out ends
+            else:
+                pygame.mixer.music.load(source, file_type)
+                pygame.mixer.music.set_volume(MUSIC_VOLUME)
+                pygame.mixer.music.play(-1)  # Loop indefinitely
 
-## Sound effects for the game
+## Sound effects for the game, decoded by start when a scene needs them rather than on import
 class Effects:
-    def __init__(self):
+    def __init__(self, channel_count=6):
+        self.channel_count = channel_count
+        self.started = False
+
+    def start(self):
+        """Start the mixer and decode every effect. Does nothing if they're already loaded."""
+        if self.started:
+            return
         try:
-            pygame.mixer.init()
+            subsystems.require("mixer")
             self.effects = {
-                "jump": {"file": "./assets/Sounds/Effects/jump.mp3", "volume": 1.0},
-                "bbq": {"file": "./assets/Sounds/Effects/bbq.mp3", "volume": 1.0},
-                "chicken": {"file": "./assets/Sounds/Effects/chicken.mp3", "volume": 0.5},
-                "rino": {"file": "./assets/Sounds/Effects/rino.mp3", "volume": 0.5},
-                "bee": {"file": "./assets/Sounds/Effects/bee.mp3", "volume": 0.2},
-                "bunny": {"file": "./assets/Sounds/Effects/bunny.mp3", "volume": 0.5},
-                "bat": {"file": "./assets/Sounds/Effects/bat.mp3", "volume": 0.3},
+                "jump": {"file": "./assets/Sounds/Effects/jump.mp3", "volume": 1.0, "cooldown": 100},
+                "bbq": {"file": "./assets/Sounds/Effects/bbq.mp3", "volume": 1.0, "cooldown": 1000},
+                "chicken": {"file": "./assets/Sounds/Effects/chicken.mp3", "volume": 0.5, "cooldown": 500},
+                "rino": {"file": "./assets/Sounds/Effects/rino.mp3", "volume": 0.5, "cooldown": 500},
+                "bee": {"file": "./assets/Sounds/Effects/bee.mp3", "volume": 0.2, "cooldown": 500},
+                "bunny": {"file": "./assets/Sounds/Effects/bunny.mp3", "volume": 0.5, "cooldown": 500},
+                "bat": {"file": "./assets/Sounds/Effects/bat.mp3", "volume": 0.3, "cooldown": 500},
             }
-            self.state = ""
+            # Decode every effect once so playing one never touches the disk
+            self.sounds = self.__load_sounds()
+            self.last_played = {name: -self.effects[name]["cooldown"] for name in self.effects}  # Time in milliseconds
+
+            # Keep a few channels just for effects so they never fight over free channels
+            pygame.mixer.set_num_channels(max(pygame.mixer.get_num_channels(), self.channel_count))
+            pygame.mixer.set_reserved(self.channel_count)
+            self.channels = [pygame.mixer.Channel(i) for i in range(self.channel_count)]
+            self.next_channel = 0
+
+            # Read the setting once and then rely on the settings screen to tell us when it changes
+            self.state = "y"
+            self.__update_state()
+            Settings.add_listener(self.on_setting_changed)
+            self.started = True
         except Exception as e:
             print(f"Error setting up effects. Error: {e}")
             exit()
+
+    def __load_sounds(self):
+        sounds = {}
+        for name, effect in self.effects.items():
+            try:
+                with startup_trace.span("asset", effect["file"]):
+                    sound = pygame.mixer.Sound(effect["file"])
+                sound.set_volume(effect["volume"])
+                sounds[name] = sound
+            except Exception as e:
+                print(f"Sound effect {name} not found. Error: {e}")
+        return sounds
     
     def __update_state(self):
         try:
-            with Database() as db:
-                self.state = db.getEffectsState()
-        except Exception:
+            self.state = repository.getEffectsState()
+        except Exception as e:
             print(f"Error accessing databse. Error: {e}")
 
+    def on_setting_changed(self, name, value):
+        """Called by the settings screen when a setting is saved."""
+        if name == "Effects":
+            self.state = value
+
+    def __get_channel(self):
+        """Pick a free reserved channel, or the one that started playing longest ago if they're all busy."""
+        for _ in range(len(self.channels)):
+            channel = self.channels[self.next_channel]
+            self.next_channel = (self.next_channel + 1) % len(self.channels)
+            if not channel.get_busy():
+                return channel
+        return channel
+
     def play_effect(self, effect_name):
-        self.__update_state()
         chance = random.randint(1,5)
         if chance != 5 and effect_name != "jump":
             return
-        elif self.state.lower() == "n" and effect_name != "jump":
+        self.start()
+        if self.state.lower() == "n" and effect_name != "jump":
             return
-        try:
-            sound = pygame.mixer.Sound(self.effects[effect_name]["file"])
-            sound.set_volume(self.effects[effect_name]["volume"])
-            sound.play()
-        except:
+        if effect_name not in self.sounds:
             print("Sound effect not found")
+            return
+
+        # Don't retrigger the same effect while it's cooling down
+        now = game_clock.get_ticks()
+        if now - self.last_played[effect_name] < self.effects[effect_name]["cooldown"]:
+            return
+        self.last_played[effect_name] = now
+        self.__get_channel().play(self.sounds[effect_name])
     
     def kill_effects(self):
-        pygame.mixer.stop()
\ No newline at end of file
+        if self.started:
+            pygame.mixer.stop()
+
+# One sound bank shared by the whole game
+effects = Effects()
@@ -1,13 +1,14 @@
 import pygame
 from button import Button
 from variables import WIDTH, HEIGHT, BIG_FONT_COLOR, BIG_FONT_SIZE, FONT_COLOR, FONT_SIZE
+from fontRegistry import fonts
+from sceneManager import Scene
 
-class GameOver:
-    def __init__(self, menu, play, score):
-        self.menu = menu
+# Shown on top of the game it ends, which stays underneath so it can be played again
+class GameOver(Scene):
+    def __init__(self, play, score):
         self.play = play
         self.score = score
-        self.clock = pygame.time.Clock()
         
         # Initialize the screen and set the window caption
         try:
@@ -39,7 +40,7 @@ class GameOver:
     def return_to_menu(self):
         """Return to the main menu."""
         try:
-            self.menu.run()
+            self.manager.pop(2)  # This screen and the game under it
         except Exception as e:
             print(f"Error returning to the menu: {e}")
             exit()
@@ -48,7 +49,7 @@ class GameOver:
         """Start a new game."""
         try:
             self.play.startgame()
-            self.play.run()
+            self.manager.pop()  # Back to the game underneath
         except Exception as e:
             print(f"Error starting a new game: {e}")
             exit()
@@ -56,7 +57,7 @@ class GameOver:
     def draw_text(self, text, y, size, color):
         """Draw text on the screen."""
         try:
-            font = pygame.font.SysFont("JetBrains Mono", size, bold=True)
+            font = fonts.get(size, bold=True)
             text_surface = font.render(text, True, color)
             text_rect = text_surface.get_rect(center=(WIDTH // 2, y))
             self.screen.blit(text_surface, text_rect)
@@ -75,20 +76,10 @@ class GameOver:
         except Exception as e:
             print(f"Error drawing elements on the screen: {e}")
 
-    def run(self):
-        """Main loop for the Game Over screen."""
-        while True:
-            try:
-                self.clock.tick(60)  # Limit frame rate to 60 FPS
-                for event in pygame.event.get():
-                    if event.type == pygame.QUIT:
-                        pygame.quit()
-                        exit()
-                    self.main_menu_button.handle_event(event)
-                    self.play_again_button.handle_event(event)
+    def handle_event(self, event):
+        self.main_menu_button.handle_event(event)
+        self.play_again_button.handle_event(event)
 
-                self.draw()
-            except Exception as e:
-                print(f"Error in game loop: {e}")
-                exit()
+    def frame(self):
+        self.draw()
 
@@ -0,0 +1,66 @@
+import pygame
+from variables import WIDTH
+from assetManager import assets
+from fontRegistry import fonts
+
+HEART_SHEET = "./assets/Health/heart.png"  # Full, half and empty hearts, 32x32 each
+
+# Health hearts and score, drawn onto one surface that's only rebuilt when either of them changes
+class Hud:
+    def __init__(self, max_hearts=5, health_per_heart=20):
+        # Full, half and empty hearts from the sprite sheet
+        self.heart_full, self.heart_half, self.heart_empty = assets.load_frames(HEART_SHEET, 32, 32, scale=1)
+        self.heart_size = 32
+        self.spacing = 3  # Space between hearts
+        self.max_hearts = max_hearts
+        self.health_per_heart = health_per_heart
+
+        # Render the label and every digit once, then build scores out of them
+        font = fonts.get(25, bold=True)
+        self.label = font.render("Score: ", True, (255, 255, 255))
+        self.digits = {digit: font.render(digit, True, (255, 255, 255)) for digit in "0123456789"}
+
+        self.surface = pygame.Surface((WIDTH, 20 + self.heart_size), pygame.SRCALPHA)
+        self.shown = None  # (health, score) currently on the surface
+        self.rebuilds = 0
+
+    @staticmethod
+    def asset_keys():
+        """load_frames arguments for the heart sheet, so it can be preloaded."""
+        return [(HEART_SHEET, 32, 32, 1, "alpha")]
+
+    def image(self, health, score):
+        """The HUD surface, rebuilt first if the health or whole-number score has changed."""
+        state = (health, int(score))
+        if state != self.shown:
+            self.__rebuild(*state)
+            self.shown = state
+        return self.surface
+
+    def draw(self, screen, health, score):
+        screen.blit(self.image(health, score), (0, 0))
+
+    def __rebuild(self, health, score):
+        self.rebuilds += 1
+        self.surface.fill((0, 0, 0, 0))
+
+        # Score in the top-left corner
+        x = 20
+        self.surface.blit(self.label, (x, 20))
+        x += self.label.get_width()
+        for digit in str(score):
+            glyph = self.digits[digit]
+            self.surface.blit(glyph, (x, 20))
+            x += glyph.get_width()
+
+        # Hearts in the top-right corner
+        hearts_to_display = health // self.health_per_heart
+        for i in range(self.max_hearts):
+            x = WIDTH - (self.heart_size + self.spacing) * (self.max_hearts - i) - 20
+            if i < hearts_to_display:
+                heart = self.heart_full
+            elif i == hearts_to_display and health % self.health_per_heart != 0:
+                heart = self.heart_half
+            else:
+                heart = self.heart_empty
+            self.surface.blit(heart, (x, 20))
@@ -1,7 +1,10 @@
 import pygame
 import os
-from functools import lru_cache
+import numpy as np
+from bisect import bisect_left
 from variables import WIDTH, HEIGHT  
+from assetManager import assets
+from gameClock import game_clock
 
 class Lava:
     def __init__(self, frames_directory, terrain_height, min_size=4, max_size=64, speed=6):
@@ -12,7 +15,7 @@ class Lava:
             # Animation variables
             self.current_frame = 0  # Current frame of the animation
             self.frame_rate = 100  # Time between frames (in milliseconds)
-            self.last_update = pygame.time.get_ticks()  # Track the last frame update time
+            self.last_update = game_clock.get_ticks()  # Track the last frame update time
 
             # Position and movement
             self.tile_width = min_size  # Initial width of each lava tile (scaled from min_size)
@@ -22,23 +25,24 @@ class Lava:
             self.speed = speed  # Speed at which the lava flows (pixels per frame)
             self.screen_width = WIDTH  # Screen width for resetting position
 
-            # Create multiple lava tiles
-            self.tiles = []
+            # Create multiple lava tiles, one array each for their x, y and size so they all move at once
             self.create_tiles(terrain_height)
+
+            # Frames scaled to every tile size, filled in the first time each frame is drawn
+            self.scaled_frames = [None] * len(self.frames)
         except Exception as e:
             print(f"Error initializing Lava: {e}")
 
-    @lru_cache(maxsize=None)
+    @staticmethod
+    def asset_keys(frames_directory):
+        """load_frames arguments for every frame in the directory, in animation order."""
+        frame_files = sorted(os.listdir(frames_directory))
+        return [(os.path.join(frames_directory, file), None, None, 1, "alpha") for file in frame_files if file.endswith(".png")]  # Only PNG files
+
     def load_frames(self, frames_directory):
         """Private method to load all individual frames from the specified directory."""
         try:
-            frames = []
-            frame_files = sorted(os.listdir(frames_directory))
-            for file in frame_files:
-                if file.endswith(".png"):  # Only load PNG files
-                    frame = pygame.image.load(os.path.join(frames_directory, file)).convert_alpha()
-                    frames.append(frame)
-            return frames
+            return [assets.load_frames(*key)[0] for key in self.asset_keys(frames_directory)]
         except Exception as e:
             print(f"Error loading frames from {frames_directory}: {e}")
             return []
@@ -47,14 +51,12 @@ class Lava:
         """Create multiple lava tiles to cover the screen."""
         try:
             num_tiles = (WIDTH // self.tile_width) + 2  # Number of tiles needed to cover the screen
-            for i in range(num_tiles):
-                tile_x = i * self.tile_width - WIDTH  # Position tiles starting from the left edge
-                # Increase tile size as it moves leftward
-                tile_size = self.max_tile_width - int(i * (self.max_tile_width - self.tile_width) / num_tiles)
-                tile_y = HEIGHT - terrain_height - tile_size  # Align above the terrain
-
-                # Store tile positions and sizes
-                self.tiles.append([tile_x, tile_y, tile_size])
+            i = np.arange(num_tiles)
+            self.tile_x = i * self.tile_width - WIDTH  # Position tiles starting from the left edge
+            # Increase tile size as it moves leftward
+            self.tile_size = self.max_tile_width - (i * (self.max_tile_width - self.tile_width) // num_tiles)
+            self.tile_y = HEIGHT - terrain_height - self.tile_size  # Align above the terrain
+            self.index_tiles()
         except Exception as e:
             print(f"Error creating lava tiles: {e}")
 
@@ -62,31 +64,67 @@ class Lava:
         """Update the lava's position and animation."""
         try:
             # Update animation
-            now = pygame.time.get_ticks()
+            now = game_clock.get_ticks()
             if now - self.last_update > self.frame_rate:
                 self.last_update = now
                 self.current_frame = (self.current_frame + 1) % len(self.frames)
 
             # Move all tiles to the right
-            for tile in self.tiles:
-                tile[0] += self.speed
+            self.tile_x += self.speed
 
-            # Reset tiles that move off-screen
-            for tile in self.tiles:
-                if tile[0] > camera_x + WIDTH:  # Tile goes off-screen to the right
-                    tile[0] = camera_x - self.tile_width  # Move tile to the left of the screen
+            # Reset tiles that move off-screen to the right by moving them to the left of the screen
+            self.tile_x[self.tile_x > camera_x + WIDTH] = camera_x - self.tile_width
+            self.index_tiles()
         except Exception as e:
             print(f"Error updating lava: {e}")
 
+    def index_tiles(self):
+        """Sort the tile positions by x once a step, so every collision check can bisect instead of scanning.
+
+        Kept as lists, a NumPy call costs more than bisecting and checking the few tiles a rect can reach.
+        """
+        order = np.argsort(self.tile_x, kind="stable")
+        self.sorted_x = self.tile_x[order].tolist()
+        self.sorted_y = self.tile_y[order].tolist()
+
+    def collides(self, rect, hit_width, hit_height):
+        """Check if a rect overlaps any lava tile, using hit boxes of the given size at each tile's position."""
+        # Only tiles with rect.left - hit_width < x < rect.right can overlap, positions are whole pixels
+        low = bisect_left(self.sorted_x, rect.left - hit_width + 1)
+        high = bisect_left(self.sorted_x, rect.right, low)
+        for tile_y in self.sorted_y[low:high]:
+            if tile_y < rect.bottom and tile_y + hit_height > rect.top:
+                return True
+        return False
+
+    def visible_tiles(self, camera_x):
+        """Indexes of the tiles that are at least partly on the screen."""
+        return np.flatnonzero((self.tile_x + self.tile_size > camera_x) & (self.tile_x < camera_x + WIDTH))
+
+    def get_scaled_frames(self, frame_index):
+        """Return a dictionary of tile size -> scaled frame, scaling each size only once per frame."""
+        scaled = self.scaled_frames[frame_index]
+        if scaled is None:
+            frame = self.frames[frame_index]
+            # Tile sizes never change after create_tiles so there are only a few dozen to build
+            scaled = {size: pygame.transform.scale(frame, (size, size)) for size in set(self.tile_size.tolist())}
+            self.scaled_frames[frame_index] = scaled
+        return scaled
+
+    def sprites(self, camera_x, behind=0):
+        """Frames and world positions of the tiles on screen, drawn behind pixels back from where they are.
+
+        Returns lists of surfaces, x and y, ready for RenderQueue.extend.
+        """
+        scaled = self.get_scaled_frames(self.current_frame)
+        visible = self.visible_tiles(camera_x + behind)  # Tiles off the screen are skipped
+        surfaces = [scaled[size] for size in self.tile_size[visible].tolist()]
+        return surfaces, (self.tile_x[visible] - behind).tolist(), self.tile_y[visible].tolist()
+
     def draw(self, screen, camera_x):
-        """Draw the lava tiles on the screen."""
+        """Draw the lava tiles on the screen in one call."""
         try:
-            frame = self.frames[self.current_frame]
-            
-            for tile in self.tiles:
-                # Adjust the tile size as it moves
-                tile_size = tile[2]
-                scaled_frame = pygame.transform.scale(frame, (tile_size, tile_size))  # Scale tile
-                screen.blit(scaled_frame, (tile[0] - camera_x, tile[1]))
+            surfaces, xs, ys = self.sprites(camera_x)
+            screen.blits([(surface, (x - camera_x, y)) for surface, x, y in zip(surfaces, xs, ys)], doreturn=False)
         except Exception as e:
             print(f"Error drawing lava: {e}")
\ No newline at end of file
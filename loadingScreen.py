@@ -0,0 +1,31 @@
+import pygame
+from variables import WIDTH, HEIGHT, BG_COLOR, BIG_FONT_COLOR, BIG_FONT_SIZE, BUTTON_COLOR
+from fontRegistry import fonts
+from sceneManager import Scene
+
+# Progress bar shown while a preload finishes, then swapped for the scene that needed it
+class Loading(Scene):
+    def __init__(self, preload, next_scene):
+        self.screen = pygame.display.set_mode((WIDTH, HEIGHT))
+        pygame.display.set_caption("Loading")
+        self.preload = preload
+        self.next_scene = next_scene  # Makes the scene to show once everything is loaded
+        self.title = fonts.get(BIG_FONT_SIZE, bold=True).render("Loading", True, BIG_FONT_COLOR)
+        self.bar = pygame.Rect(WIDTH // 4, HEIGHT // 2 + 40, WIDTH // 2, 24)
+
+    def resume(self):
+        pygame.display.set_caption("Loading")
+
+    def frame(self):
+        self.preload.update(budget_ms=12)  # Nothing else to do this frame, so convert more than the menu would
+        if self.preload.done:
+            self.manager.replace(self.next_scene())
+            return
+
+        self.screen.fill(BG_COLOR)
+        self.screen.blit(self.title, self.title.get_rect(center=(WIDTH // 2, HEIGHT // 2 - 40)))
+        pygame.draw.rect(self.screen, BUTTON_COLOR, self.bar, 2)
+        filled = self.bar.inflate(-8, -8)
+        filled.width = int(filled.width * self.preload.progress)
+        pygame.draw.rect(self.screen, BUTTON_COLOR, filled)
+        pygame.display.flip()
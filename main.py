@@ -1,20 +1,26 @@
+import sys
+from startupTrace import startup_trace
+if __name__ == "__main__" and any(arg.startswith("--trace-startup") for arg in sys.argv):
+    startup_trace.enable()  # Imports are only timed if tracing starts before them
+
 import pygame
+import argparse
 from gameMusic import Music
 from button import Button
 from settings import Settings
 from customise import Customise
-from game import Play
-from variables import WIDTH, HEIGHT, FPS, BIG_FONT_COLOR, BIG_FONT_SIZE
-
-# Initialize pygame
-pygame.init()
+from game import Play, level_assets
+from loadingScreen import Loading
+from assetManager import assets
+from variables import WIDTH, HEIGHT, BIG_FONT_COLOR, BIG_FONT_SIZE
+from fontRegistry import fonts
+from sceneManager import Scene, SceneManager
+from subsystems import subsystems
 
 # Menu class
-class Menu:
-    def __init__(self):
-        # Initialize clock for FPS control
-        self.clock = pygame.time.Clock()
-        
+class Menu(Scene):
+    def __init__(self, record_path=None):
+        self.record_path = record_path  # Save a replay of every game started from this menu
         # Create the game window
         self.screen = pygame.display.set_mode((WIDTH, HEIGHT))
         pygame.display.set_caption("Main Menu")
@@ -27,14 +33,16 @@ class Menu:
         self.button2 = Button("Customise", 300, 300, 300, 70, self.customise_button)
         self.button3 = Button("Settings", 300, 380, 300, 70, self.settings_button)
         
-        # Initialize and play menu music
+        # Initialize the music, the menu track starts whenever the menu is shown
         self.music = Music()
-        self.music.play_music("menu")
+
+        # Start decoding the saved character and the level while the menu is idle
+        self.preload = assets.preload(level_assets())
 
     def _load_background(self, image_path):
         """Private method to load and scale the background image."""
         try:
-            image = pygame.image.load(image_path).convert()  # .convert() loads the image in an ideal format for pygame
+            image = assets.load_image(image_path, pixel_format="opaque")  # Converted to the display format and cached
             return pygame.transform.scale(image, (WIDTH, HEIGHT))
         except FileNotFoundError:
             print(f"Background image file not found: {image_path}")
@@ -45,23 +53,23 @@ class Menu:
 
     # Button callback functions
     def play_button(self):
-        """Starts the game when 'Play' is clicked."""
-        game = Play(menu, self.music)
-        game.run()
+        """Starts the game when 'Play' is clicked, after a loading screen if the level isn't ready yet."""
+        if self.preload.done:
+            self.manager.push(Play(self.music, record_path=self.record_path))
+        else:
+            self.manager.push(Loading(self.preload, lambda: Play(self.music, record_path=self.record_path)))
 
     def customise_button(self):
         """Opens the customization menu."""
-        customise = Customise(menu)
-        customise.run()
+        self.manager.push(Customise())
 
     def settings_button(self):
         """Opens the settings menu."""
-        setting = Settings(menu)
-        setting.run()
+        self.manager.push(Settings())
 
     def draw_big_text(self, text):
         """Draws large text at a given y-coordinate."""
-        font = pygame.font.SysFont("JetBrains Mono", BIG_FONT_SIZE, bold=True)
+        font = fonts.get(BIG_FONT_SIZE, bold=True)
         text_surface = font.render(text, True, BIG_FONT_COLOR)
         text_rect = text_surface.get_rect(center=(WIDTH // 2, 120))
         self.screen.blit(text_surface, text_rect)
@@ -78,26 +86,36 @@ class Menu:
         except Exception as e:
             print(f"Error drawing the menu: {e}")
 
-    def run(self):
-        """Main loop for the menu."""
-        while True:
-            self.clock.tick(FPS)  # Limit frame rate
-            
-            # Event handling loop
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-                    exit()
-                
-                # Handle button interactions
-                self.button1.handle_event(event)
-                self.button2.handle_event(event)
-                self.button3.handle_event(event)
-            
-            # Draw everything on the screen
-            self.draw()
+    def handle_event(self, event):
+        """Handle button interactions."""
+        self.button1.handle_event(event)
+        self.button2.handle_event(event)
+        self.button3.handle_event(event)
+
+    def resume(self):
+        pygame.display.set_caption("Main Menu")
+        self.music.play_music("menu")  # Fades the game's track out when coming back from it
+        self.preload = assets.preload(level_assets())  # The character may have changed, or sheets been evicted
+
+    def frame(self):
+        self.preload.update()  # Finish a few preloaded sheets each frame
+        self.draw()
 
 # Run the menu if this script is executed directly
 if __name__ == "__main__":
-    menu = Menu()
-    menu.run()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Open the game at the main menu")
+    parser.add_argument("--scene-memory", action="store_true", help="print how much surface memory each open screen holds whenever one opens or closes")
+    parser.add_argument("--frames", type=int, help="quit after showing this many frames, e.g. 1 to measure startup")
+    parser.add_argument("--record", help="save a replay of every game played to this file, numbering the games after the first")
+    parser.add_argument("--trace-startup", action="store_true", help="time every import, subsystem and asset load up to the first frame")
+    parser.add_argument("--trace-startup-json", help="save the startup trace to this JSON file, implies --trace-startup")
+    args, _ = parser.parse_known_args()  # Options meant for game.py are passed through when it runs this file
+    if args.trace_startup_json:
+        startup_trace.enable(json_path=args.trace_startup_json)
+
+    subsystems.require("display")
+    scenes = SceneManager(report_memory=args.scene_memory)
+    with startup_trace.span("scene", "Menu"):
+        scenes.push(Menu(record_path=args.record))
+    scenes.run(frames=args.frames)
+    subsystems.quit()
\ No newline at end of file
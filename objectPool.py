@@ -0,0 +1,53 @@
+# Keeps released objects of one type so they can be spawned again instead of built from scratch
+class Pool:
+    def __init__(self, cls):
+        self.cls = cls
+        self.free = []  # Released objects waiting to be reused
+        self.created = 0  # Objects this pool has ever built
+        self.in_use = 0
+        self.high_water = 0  # Most objects in use at once
+
+    def acquire(self, *args):
+        """Return a free object reset with args, or a new one if none are free."""
+        if self.free:
+            obj = self.free.pop()
+            obj.reset(*args)
+        else:
+            obj = self.cls(*args)
+            self.created += 1
+        self.in_use += 1
+        self.high_water = max(self.high_water, self.in_use)
+        return obj
+
+    def release(self, obj):
+        """Hand an object back so the next acquire can reuse it."""
+        self.free.append(obj)
+        self.in_use -= 1
+
+    def stats(self):
+        return {"in_use": self.in_use, "free": len(self.free), "created": self.created, "high_water": self.high_water}
+
+# A pool for every type of enemy, trap or other object that gets spawned over and over
+class PoolRegistry:
+    def __init__(self):
+        self.__pools = {}  # class -> Pool
+
+    def get_pool(self, cls):
+        pool = self.__pools.get(cls)
+        if pool is None:
+            pool = self.__pools[cls] = Pool(cls)
+        return pool
+
+    def acquire(self, cls, *args):
+        """Return an object of type cls, reusing a released one if there is one. cls must have a reset(*args) method."""
+        return self.get_pool(cls).acquire(*args)
+
+    def release(self, obj):
+        self.get_pool(type(obj)).release(obj)
+
+    def stats(self):
+        """Return the counters of every pool by class name, for debugging and benchmarks."""
+        return {cls.__name__: pool.stats() for cls, pool in self.__pools.items()}
+
+# One set of pools for the whole game
+pools = PoolRegistry()
@@ -0,0 +1,63 @@
+import pygame
+
+LAYERS = ("background", "terrain", "player", "fruit", "enemies", "traps", "lava", "hud")  # Back to front
+SCREEN_LAYERS = ("background", "terrain", "hud")  # Already in screen coordinates, the camera doesn't move them
+FAST_BLITS = hasattr(pygame.Surface, "fblits")  # pygame-ce only, quicker than blits but can't draw part of a surface
+
+# Everything a frame draws, collected per layer as surfaces at world positions. flush moves each world
+# layer by the camera in one go and draws the whole frame in as few blits calls as possible.
+class RenderQueue:
+    def __init__(self, layers=LAYERS, screen_layers=SCREEN_LAYERS):
+        self.layers = {layer: ([], [], [], []) for layer in layers}  # Layer -> surfaces, x, y and source areas
+        self.screen_layers = set(screen_layers)
+        self.draw_calls = 0  # Calls made by the last flush
+        self.sprites = 0  # Surfaces drawn by the last flush
+
+    def add(self, layer, surface, x, y, area=None):
+        """Queue a surface at a world position, or a screen position on a screen layer. area draws only part of it."""
+        surfaces, xs, ys, areas = self.layers[layer]
+        surfaces.append(surface)
+        xs.append(x)
+        ys.append(y)
+        areas.append(area)
+
+    def extend(self, layer, surfaces, xs, ys):
+        """Queue many whole surfaces at once, e.g. every lava tile, given lists of their x and y positions."""
+        layer_surfaces, layer_xs, layer_ys, areas = self.layers[layer]
+        layer_surfaces.extend(surfaces)
+        layer_xs.extend(xs)
+        layer_ys.extend(ys)
+        areas.extend([None] * len(surfaces))
+
+    def flush(self, screen, camera_x):
+        """Draw everything queued back to front and empty the queue.
+
+        Layers that draw part of a surface need blits, the rest share fblits where pygame has it.
+        """
+        batch = []
+        batch_areas = False
+        self.draw_calls = self.sprites = 0
+        for layer, (surfaces, xs, ys, areas) in self.layers.items():
+            if not surfaces:
+                continue
+            has_areas = any(area is not None for area in areas)
+            if batch and has_areas != batch_areas:
+                self.__submit(screen, batch, batch_areas)
+                batch = []
+            batch_areas = has_areas
+
+            shift = 0 if layer in self.screen_layers else camera_x
+            positions = zip([x - shift for x in xs], ys)
+            batch.extend(zip(surfaces, positions, areas) if has_areas else zip(surfaces, positions))
+            self.sprites += len(surfaces)
+            for column in (surfaces, xs, ys, areas):
+                column.clear()
+        if batch:
+            self.__submit(screen, batch, batch_areas)
+
+    def __submit(self, screen, batch, has_areas):
+        if FAST_BLITS and not has_areas:
+            screen.fblits(batch)
+        else:
+            screen.blits(batch, doreturn=False)
+        self.draw_calls += 1
@@ -0,0 +1,62 @@
+import pygame
+import zlib
+import struct
+
+# A replay file is this header followed by the zlib-compressed input of every simulation step, one byte each
+MAGIC = b"GGRP"
+VERSION = 1
+HEADER = struct.Struct("<4sBIBBdIdi")  # Magic, version, seed, enemies, flags, start ms, steps, score, health
+ENEMY_STORE = 1  # Flag for a game played with the NumPy enemy store
+
+# The keys handle_input reads, one bit each. Any key of a group sets the bit, the first one is pressed on replay
+KEY_BITS = (
+    (pygame.K_LEFT, pygame.K_a),
+    (pygame.K_RIGHT, pygame.K_d),
+    (pygame.K_SPACE, pygame.K_UP, pygame.K_w),
+    (pygame.K_q,),
+)
+
+def encode_keys(keys):
+    """Pack the keys the game reads out of a get_pressed result into one byte."""
+    mask = 0
+    for bit, group in enumerate(KEY_BITS):
+        if any(keys[key] for key in group):
+            mask |= 1 << bit
+    return mask
+
+def decode_keys(mask):
+    """The set of held keys a byte from encode_keys stands for."""
+    return {group[0] for bit, group in enumerate(KEY_BITS) if mask & (1 << bit)}
+
+# Everything needed to play a game again exactly: the seed and settings it started with and the keys held
+# at every step, plus how it ended so a replay can check it came out the same
+class Recording:
+    def __init__(self, seed, enemy_count, enemy_store, start_ms, steps=None, score=0.0, health=0):
+        self.seed = seed  # The random module is seeded with this as the game starts
+        self.enemy_count = enemy_count  # The number of enemies setting
+        self.enemy_store = enemy_store
+        self.start_ms = start_ms  # Game clock when the game started, timers are compared against it
+        self.steps = bytearray() if steps is None else steps  # encode_keys for each simulation step
+        self.score = score
+        self.health = health
+
+    def record(self, keys):
+        self.steps.append(encode_keys(keys))
+
+    def save(self, path):
+        flags = ENEMY_STORE if self.enemy_store else 0
+        header = HEADER.pack(MAGIC, VERSION, self.seed, self.enemy_count, flags, self.start_ms, len(self.steps), self.score, self.health)
+        with open(path, "wb") as f:
+            f.write(header + zlib.compress(bytes(self.steps), 9))
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            data = f.read()
+        magic, version, seed, enemy_count, flags, start_ms, step_count, score, health = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} isn't a version {VERSION} replay")
+        steps = bytearray(zlib.decompress(data[HEADER.size:]))
+        if len(steps) != step_count:
+            raise ValueError(f"{path} is cut short, it has {len(steps)} of {step_count} steps")
+        return cls(seed, enemy_count, bool(flags & ENEMY_STORE), start_ms, steps, score, health)
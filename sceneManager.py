@@ -0,0 +1,131 @@
+import pygame
+from variables import FPS
+from startupTrace import startup_trace
+
+# A screen of the game. The SceneManager sends it events and calls frame once per loop while it's on top.
+class Scene:
+    fps = FPS  # Frame rate the loop is capped at while this scene is on top
+    manager = None  # The SceneManager running this scene, None if it isn't on a stack
+
+    def handle_event(self, event):
+        """React to one pygame event."""
+
+    def frame(self):
+        """Update and draw one frame, including flipping the display."""
+
+    def resume(self):
+        """Called whenever the scene comes to the top of the stack, when pushed or when the one above is popped."""
+
+    def release(self):
+        """Called once the scene has been popped for good. Drops everything it holds so its surfaces can be freed."""
+        vars(self).clear()
+
+    def memory_bytes(self):
+        """Bytes of pixel data in the surfaces this scene holds, not counting other scenes."""
+        return surface_bytes(self, root=self)
+
+def surface_bytes(obj, root=None, depth=4, seen=None):
+    """Add up the pixel data of every surface reachable from obj through attributes and containers."""
+    seen = set() if seen is None else seen
+    if id(obj) in seen or depth < 0:
+        return 0
+    seen.add(id(obj))
+    if isinstance(obj, pygame.Surface):
+        if obj is pygame.display.get_surface():
+            return 0  # The window is shared by every scene
+        return obj.get_width() * obj.get_height() * obj.get_bytesize()
+    if isinstance(obj, Scene) and obj is not root:
+        return 0  # Another scene's surfaces are counted against that scene
+    if isinstance(obj, dict):
+        children = obj.values()
+    elif isinstance(obj, (list, tuple, set)):
+        children = obj
+    elif hasattr(obj, "__dict__") and not isinstance(obj, type):
+        children = vars(obj).values()
+    else:
+        return 0
+    return sum(surface_bytes(child, root, depth - 1, seen) for child in children)
+
+# Stack of scenes with one loop for the whole game. Changes asked for during a frame happen once it ends,
+# so a scene is never torn down while it's still running.
+class SceneManager:
+    def __init__(self, report_memory=False):
+        self.scenes = []
+        self.pending = []  # Changes to make at the end of the frame, (operation, argument)
+        self.clock = pygame.time.Clock()
+        self.report_memory = report_memory  # Print each scene's memory whenever the stack changes
+
+    @property
+    def top(self):
+        return self.scenes[-1] if self.scenes else None
+
+    @property
+    def changing(self):
+        """True if the stack is about to change, so the top scene can stop doing work."""
+        return bool(self.pending)
+
+    def push(self, scene):
+        """Show a scene on top of the current one, which stays on the stack underneath."""
+        self.pending.append(("push", scene))
+
+    def pop(self, count=1):
+        """Close the top count scenes and go back to the one under them."""
+        self.pending.append(("pop", count))
+
+    def replace(self, scene):
+        """Close the top scene and show another in its place."""
+        self.pending.append(("pop", 1))
+        self.pending.append(("push", scene))
+
+    def apply_changes(self):
+        """Make the changes asked for since the last frame."""
+        if not self.pending:
+            return
+        pending, self.pending = self.pending, []
+        previous_top = self.top
+        for operation, argument in pending:
+            if operation == "push":
+                argument.manager = self
+                self.scenes.append(argument)
+            else:
+                for _ in range(min(argument, len(self.scenes))):
+                    scene = self.scenes.pop()
+                    scene.release()
+                    scene.manager = None
+        if self.top is not None and self.top is not previous_top:
+            self.top.resume()
+        if self.report_memory:
+            self.print_memory()
+
+    def memory(self):
+        """(scene name, bytes of surfaces) for every scene on the stack, bottom first."""
+        return [(type(scene).__name__, scene.memory_bytes()) for scene in self.scenes]
+
+    def print_memory(self):
+        report = ", ".join(f"{name} {size / 1024:.0f} KB" for name, size in self.memory())
+        print(f"Scenes: {report or 'none'}")
+
+    def quit(self):
+        """Release every scene, bottom one last."""
+        self.pending = [("pop", len(self.scenes))]
+        self.apply_changes()
+
+    def run(self, frames=None):
+        """Run the top scene until the stack is empty or the window is closed, or for a number of frames."""
+        self.apply_changes()
+        while self.scenes and frames != 0:
+            scene = self.top
+            self.clock.tick(scene.fps)
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    self.quit()
+                    return
+                scene.handle_event(event)
+                if self.pending:
+                    break  # The rest of the events were meant for this scene, not the next one
+            if not self.pending:
+                scene.frame()
+                startup_trace.frame_presented()
+                if frames is not None:
+                    frames -= 1
+            self.apply_changes()
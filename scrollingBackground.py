@@ -0,0 +1,41 @@
+import pygame
+from variables import WIDTH
+
+# A repeating image pre-tiled onto a strip one screen plus one tile wide, so drawing it is a single blit
+class ScrollingLayer:
+    def __init__(self, image, y=0, height=None, parallax=1.0):
+        self.y = y
+        self.parallax = parallax  # How fast the layer scrolls compared to the camera, less than 1 looks further away
+        self.tile_width = image.get_width()
+        height = height or image.get_height()
+
+        # Same pixel format as the image so opaque layers stay opaque and transparent ones keep their alpha
+        self.strip = pygame.Surface((WIDTH + self.tile_width, height), image.get_flags(), image)
+        for x in range(0, self.strip.get_width(), self.tile_width):
+            for tile_y in range(0, height, image.get_height()):
+                self.strip.blit(image, (x, tile_y))
+
+    def sprite(self, camera_x):
+        """(strip, screen x, y, area) showing the part of the strip in view."""
+        # The strip repeats every tile width, so the slice starting at the scroll position modulo a tile always fits
+        offset = int(camera_x * self.parallax) % self.tile_width
+        return self.strip, 0, self.y, (offset, 0, WIDTH, self.strip.get_height())
+
+    def draw(self, screen, camera_x):
+        strip, x, y, area = self.sprite(camera_x)
+        screen.blit(strip, (x, y), area)
+
+    def get_bytes(self):
+        return self.strip.get_width() * self.strip.get_height() * self.strip.get_bytesize()
+
+# Layers drawn back to front, each one costing one blit however many times its image repeats
+class ScrollingBackground:
+    def __init__(self, layers):
+        self.layers = layers
+
+    def sprites(self, camera_x):
+        return [layer.sprite(camera_x) for layer in self.layers]
+
+    def draw(self, screen, camera_x):
+        for layer in self.layers:
+            layer.draw(screen, camera_x)
@@ -1,12 +1,20 @@
 import pygame
 from variables import WIDTH, HEIGHT, BG_COLOR, FONT_COLOR, FONT_SIZE
 from button import Button  
-from database import Database
+from database import repository
+from fontRegistry import fonts
+from sceneManager import Scene
 
-class Settings:
-    def __init__(self, menu):
-        self.__menu = menu
-        self.__clock = pygame.time.Clock()  # Clock to control the frame rate
+class Settings(Scene):
+    # Functions called with (setting name, value) whenever the settings are saved
+    listeners = []
+
+    @classmethod
+    def add_listener(cls, listener):
+        """Register a function to be told about saved settings, so it doesn't have to keep reading the database."""
+        cls.listeners.append(listener)
+
+    def __init__(self):
         self.__screen = pygame.display.set_mode((WIDTH, HEIGHT))  # Set the display size
         pygame.display.set_caption("Settings")  # Set the window title
         
@@ -18,9 +26,8 @@ class Settings:
 
         # Fetch number of enemies and sound effects state from the database
         try:
-            with Database() as db:
-                self.__num_enemies = db.getNumberofEnemies()  # Get the current number of enemies
-                self.__sound_effects = db.getEffectsState()  # Get the current state of sound effects
+            self.__num_enemies = repository.getNumberofEnemies()  # Get the current number of enemies
+            self.__sound_effects = repository.getEffectsState()  # Get the current state of sound effects
         except Exception as e:
             print(f"Error accessing database: {e}")
             self.__num_enemies = 3  # Default value in case of error
@@ -57,7 +64,7 @@ class Settings:
             self.__sound_button.draw(self.__screen)
 
             # Display text for current settings
-            font = pygame.font.SysFont("JetBrains Mono", FONT_SIZE, bold=True)
+            font = fonts.get(FONT_SIZE, bold=True)
             text = font.render(f"Number of Enemies: {self.__num_enemies}", True, (255, 255, 255))  # White color for text
             self.__screen.blit(text, (30, 50))  # Position the number of enemies text
 
@@ -69,29 +76,27 @@ class Settings:
         except Exception as e:
             print(f"Error drawing screen: {e}")
 
-    def __handle_events(self):
+    def handle_event(self, event):
         """Handle user input events (such as button clicks)."""
         try:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit()  # Quit the game if the window is closed
-                    exit()
-                
-                # Handle button events (clicks)
-                self.__back_button.handle_event(event)
-                self.__plus_button.handle_event(event)
-                self.__minus_button.handle_event(event)
-                self.__sound_button.handle_event(event)
+            # Handle button events (clicks)
+            self.__back_button.handle_event(event)
+            self.__plus_button.handle_event(event)
+            self.__minus_button.handle_event(event)
+            self.__sound_button.handle_event(event)
         except Exception as e:
             print(f"Error handling events: {e}")
 
     def __back_to_menu(self):
         """Save current settings and return to the main menu."""
         try:
-            with Database() as db:
-                db.updateNumberofEnemies(self.__num_enemies)  # Save number of enemies to database
-                db.updateEffectsState(self.__sound_effects)  # Save sound effects state to database
-            self.__menu.run()  # Return to the main menu screen
+            repository.updateNumberofEnemies(self.__num_enemies)  # Save number of enemies to database
+            repository.updateEffectsState(self.__sound_effects)  # Save sound effects state to database
+            repository.flush()  # Written on a background thread as we leave the screen
+            for listener in Settings.listeners:
+                listener("NumberEnemies", self.__num_enemies)
+                listener("Effects", self.__sound_effects)
+            self.manager.pop()  # Return to the main menu screen underneath
         except Exception as e:
             print(f"Error saving settings to database: {e}")
 
@@ -124,13 +129,5 @@ class Settings:
         except Exception as e:
             print(f"Error toggling sound effects: {e}")
 
-    def run(self):
-        """Main loop for running the settings screen."""
-        while True:
-            try:
-                self.__clock.tick(60)  # Limit the game loop to 60 frames per second
-                self.__handle_events()  # Check for and handle any events
-                self.__draw()  # Draw the updated screen
-            except Exception as e:
-                print(f"Error in the main loop: {e}")
-                break  # Exit the loop if there's an error
\ No newline at end of file
+    def frame(self):
+        self.__draw()  # Draw the updated screen
\ No newline at end of file
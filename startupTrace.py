@@ -0,0 +1,92 @@
+import sys
+import time
+import json
+import builtins
+from contextlib import contextmanager
+
+# Times everything from starting the program to the first frame on screen: each import, each pygame
+# subsystem and each asset loaded. Only standard library imports here, so it can start before the rest.
+class StartupTrace:
+    def __init__(self):
+        self.enabled = False
+        self.json_path = None  # File to save the trace to once the first frame is shown
+        self.start = None
+        self.events = []  # (kind, name, started at ms, total ms, self ms) in the order they finished
+        self.first_frame_ms = None
+        self.__children = []  # Time spent in nested spans for each open span, so nothing is counted twice
+        self.__import = None  # builtins.__import__ from before tracing started
+
+    def enable(self, json_path=None):
+        """Start tracing, before the imports that should be timed."""
+        self.json_path = json_path or self.json_path
+        if self.enabled or self.first_frame_ms is not None:
+            return
+        self.enabled = True
+        self.start = time.perf_counter()
+        self.__import = builtins.__import__
+        builtins.__import__ = self.__timed_import
+
+    def __timed_import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        if level or name in sys.modules:  # Already imported, or relative so it's counted in its package
+            return self.__import(name, globals, locals, fromlist, level)
+        with self.span("import", name):
+            return self.__import(name, globals, locals, fromlist, level)
+
+    @contextmanager
+    def span(self, kind, name):
+        """Time the body as one step of startup, e.g. with startup_trace.span("asset", path)."""
+        if not self.enabled:
+            yield
+            return
+        self.__children.append(0.0)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            total = time.perf_counter() - start
+            children = self.__children.pop()
+            if self.__children:
+                self.__children[-1] += total
+            self.events.append((kind, name, (start - self.start) * 1000, total * 1000, (total - children) * 1000))
+
+    def frame_presented(self):
+        """Call after every flip. The first one ends the trace and prints the report."""
+        if not self.enabled:
+            return
+        self.first_frame_ms = (time.perf_counter() - self.start) * 1000
+        self.enabled = False
+        builtins.__import__ = self.__import
+        self.print_report()
+        if self.json_path:
+            self.save(self.json_path)
+
+    def totals(self):
+        """Milliseconds spent in each kind of step, not counting steps inside other steps twice."""
+        totals = {}
+        for kind, _, _, _, own in self.events:
+            totals[kind] = totals.get(kind, 0.0) + own
+        totals["other"] = self.first_frame_ms - sum(totals.values())  # Python code between the traced steps
+        return totals
+
+    def print_report(self, count=15):
+        print(f"First frame shown after {self.first_frame_ms:.1f} ms")
+        for kind, total in self.totals().items():
+            steps = sum(1 for event in self.events if event[0] == kind)
+            print(f"  {kind:<7}{total:8.1f} ms" + (f" in {steps} steps" if steps else ""))
+        print(f"Slowest {count} steps (not counting the steps inside them):")
+        for kind, name, started, _, own in sorted(self.events, key=lambda event: -event[4])[:count]:
+            print(f"  {own:8.1f} ms  {kind:<7}{name}  (at {started:.0f} ms)")
+
+    def save(self, path):
+        with open(path, "w") as f:
+            json.dump({
+                "first_frame_ms": self.first_frame_ms,
+                "totals_ms": self.totals(),
+                "steps": [
+                    {"kind": kind, "name": name, "start_ms": started, "total_ms": total, "self_ms": own}
+                    for kind, name, started, total, own in self.events
+                ],
+            }, f, indent=1)
+
+# One trace for the whole process
+startup_trace = StartupTrace()
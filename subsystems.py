@@ -0,0 +1,29 @@
+import pygame
+from startupTrace import startup_trace
+
+# pygame's subsystems, each started the first time something needs it instead of all of them at import time
+class Subsystems:
+    STARTERS = {
+        "display": pygame.display.init,
+        "font": pygame.font.init,
+        "mixer": pygame.mixer.init,
+    }
+
+    def __init__(self):
+        self.started = []  # Names in the order they were started
+
+    def require(self, *names):
+        """Start any of the named subsystems that aren't running yet. Errors are left to the caller."""
+        for name in names:
+            if name not in self.started:
+                with startup_trace.span("init", name):
+                    self.STARTERS[name]()
+                self.started.append(name)
+
+    def quit(self):
+        """Shut every subsystem down at the end of the program."""
+        pygame.quit()
+        self.started.clear()
+
+# One set of subsystems for the whole process
+subsystems = Subsystems()
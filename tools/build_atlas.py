@@ -0,0 +1,146 @@
+# Packs every sprite the game loads, already scaled to its in-game size, into a few atlas images plus an index
+# Run from the repository root: python tools/build_atlas.py [--page-size 2048]
+# Rerun it whenever a sprite changes, the game cuts sprites from assets/Atlas whenever atlas.json is there
+import os
+import sys
+import json
+import time
+import argparse
+
+# Building needs no window or sound
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+
+OUTPUT_DIRECTORY = "./assets/Atlas"
+INDEX_NAME = "atlas.json"
+
+def load_everything():
+    """Create one of every character, enemy, trap, fruit, the lava and the HUD, so each sprite is loaded the way the game loads it."""
+    from character import Character
+    from enemies import enemy_land, enemy_air
+    from traps import traps
+    from fruits import Fruit
+    from lava import Lava
+    from hud import Hud
+    from assetManager import assets
+    from variables import TERRAIN
+
+    characters = "./assets/MainCharacters"
+    for name in sorted(os.listdir(characters)):
+        if os.path.isdir(os.path.join(characters, name)):
+            Character({action: f"{characters}/{name}/{action}.png" for action in ("idle", "run", "jump", "double_jump")})
+    for enemy_type in enemy_land + enemy_air:
+        enemy = enemy_type(0, 0)
+        for animation in enemy.sprite_sheets:
+            enemy.set_animation(animation)
+    for trap_type in traps:
+        trap_type()
+    fruit = Fruit("./assets/Fruits/", frame_count=14, frame_width=32, frame_height=32)
+    for sheet in fruit.fruit_sheets:  # A fruit only loads the sheet it picked, so load the rest the same way
+        assets.load_frames(sheet, fruit.fruit_width // 2, fruit.fruit_height // 2, scale=2)
+    Lava(frames_directory="./assets/Lava", terrain_height=TERRAIN)
+    Hud()
+
+def sprite_name(path):
+    """(entity, animation) for a sprite sheet, e.g. ("Enemies/Chicken", "Run (32x34)")."""
+    relative = os.path.relpath(path, "./assets")
+    entity, file_name = os.path.split(relative)
+    return entity.replace(os.sep, "/"), os.path.splitext(file_name)[0]
+
+def pack(sizes, page_size):
+    """Place rectangles of the given sizes on as few pages as possible, a row at a time, tallest first.
+
+    Returns a (page, x, y) for each size and the height used on each page.
+    """
+    placements = [None] * len(sizes)
+    heights = []
+    x = y = row_height = 0
+    for i in sorted(range(len(sizes)), key=lambda i: (-sizes[i][1], -sizes[i][0])):
+        width, height = sizes[i]
+        if width > page_size or height > page_size:
+            raise ValueError(f"A {width}x{height} sprite doesn't fit on a {page_size}x{page_size} page")
+        if x + width > page_size:  # Start a new row
+            x, y, row_height = 0, y + row_height, 0
+        if not heights or y + height > page_size:  # Start a new page
+            heights.append(0)
+            x = y = row_height = 0
+        placements[i] = (len(heights) - 1, x, y)
+        x += width
+        row_height = max(row_height, height)
+        heights[-1] = max(heights[-1], y + height)
+    return placements, heights
+
+def build(page_size):
+    from assetManager import assets
+
+    assets.atlas_index = None  # Decode every sprite from its own file, not from an atlas built before
+    start = time.perf_counter()
+    load_everything()
+    decode_ms = (time.perf_counter() - start) * 1000
+
+    # Only sprites with transparency are packed, opaque images like backgrounds stay as they are
+    sheets = [(key, frames) for key, frames in assets.cached() if key[4] == "alpha"]
+    frames = [frame for _, sheet_frames in sheets for frame in sheet_frames]
+    placements, heights = pack([frame.get_size() for frame in frames], page_size)
+
+    pages = [pygame.Surface((page_size, height), pygame.SRCALPHA) for height in heights]
+    for frame, (page, x, y) in zip(frames, placements):
+        pages[page].blit(frame, (x, y), special_flags=pygame.BLEND_RGBA_ADD)  # Adding onto clear pixels copies them exactly
+
+    os.makedirs(OUTPUT_DIRECTORY, exist_ok=True)
+    page_names = []
+    for i, page in enumerate(pages):
+        page_names.append(f"atlas{i}.png")
+        pygame.image.save(page, os.path.join(OUTPUT_DIRECTORY, page_names[-1]))
+
+    sprites = []
+    placed = iter(zip(frames, placements))
+    for (path, frame_width, frame_height, scale, _), sheet_frames in sheets:
+        entity, animation = sprite_name(path)
+        rects = []
+        for frame, (page, x, y) in (next(placed) for _ in sheet_frames):
+            rects.append([page, x, y, frame.get_width(), frame.get_height()])
+        sprites.append({
+            "entity": entity, "animation": animation, "path": path,
+            "frame_width": frame_width, "frame_height": frame_height, "scale": scale,
+            "frames": rects,  # Frame number -> [page, x, y, width, height]
+        })
+    index_path = os.path.join(OUTPUT_DIRECTORY, INDEX_NAME)
+    with open(index_path, "w") as f:
+        json.dump({"pages": page_names, "sprites": sprites}, f, indent=1)
+
+    print(f"Packed {len(frames)} frames from {len(sprites)} sheets onto {len(pages)} page(s) of {page_size}x{max(heights)}")
+    print(f"Decoding every sheet took {decode_ms:.1f} ms")
+    return index_path, sheets
+
+def check(index_path, sheets):
+    """Load every sprite back out of the atlas, time it and check it matches what was packed."""
+    from assetManager import AssetManager
+
+    atlas = AssetManager(atlas_index=index_path)
+    start = time.perf_counter()
+    loaded = [atlas.load_frames(*key) for key, _ in sheets]
+    atlas_ms = (time.perf_counter() - start) * 1000
+
+    for (key, frames), atlas_frames in zip(sheets, loaded):
+        if len(frames) != len(atlas_frames) or any(
+            pygame.image.tobytes(a, "RGBA") != pygame.image.tobytes(b, "RGBA") for a, b in zip(frames, atlas_frames)
+        ):
+            raise SystemExit(f"Atlas doesn't match {key[0]}")
+    print(f"Loading them from the atlas took {atlas_ms:.1f} ms, every frame matches")
+
+def main():
+    parser = argparse.ArgumentParser(description="Pack the game's sprites into atlas images")
+    parser.add_argument("--page-size", type=int, default=2048, help="width and maximum height of each atlas image")
+    args = parser.parse_args()
+
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+    check(*build(args.page_size))
+    pygame.quit()
+
+if __name__ == "__main__":
+    main()
@@ -1,18 +1,13 @@
 import pygame
 import random
 from variables import WIDTH
-from functools import lru_cache
+from assetManager import assets
+from objectPool import pools
 
-# Use lru_cache to cache loaded images
-@lru_cache(maxsize=None)  # This decorator caches the result of the load_image function
 def load_image(image_path, scale_factor):
-    """Load an image and scale it, using a cache to avoid reloading."""
+    """Load an image and scale it, using the shared asset cache to avoid reloading."""
     try:
-        # Load the image from the specified path
-        image = pygame.image.load(image_path).convert_alpha()
-        # Scale the image by the given factor
-        scaled_image = pygame.transform.scale(image, (image.get_width() * scale_factor, image.get_height() * scale_factor))
-        return scaled_image
+        return assets.load_image(image_path, scale=scale_factor)
     except pygame.error as e:
         print(f"Error loading image {image_path}: {e}")
         return None  # Return None if there was an error
@@ -24,6 +19,12 @@ class Trap:
         self.trap_width = self.trap_image.get_width()
         self.trap_height = self.trap_image.get_height()
         self.trap_position = None  
+        self.rect = None  # Hit box, made when the trap is placed
+
+    def reset(self):
+        """Take the trap off the map so a pooled trap can be placed again."""
+        self.trap_position = None
+        self.rect = None
 
     def _load_trap_image(self, trap_image_path, scale_factor):
         """Private method to load the trap image and handle errors."""
@@ -44,16 +45,15 @@ class Trap:
                 x_position = camera_x + WIDTH + random.randint(50, 200)
                 y_position = terrain_height - self.trap_height
                 self.trap_position = (x_position, y_position)
+                self.rect = pygame.Rect(x_position, y_position, self.trap_width, self.trap_height)
         except Exception as e:
             print(f"Error spawning trap: {e}")
 
     def check_collision(self, player_rect):
         """Checks if the player collides with the trap."""
         try:
-            if self.trap_position:
-                trap_rect = pygame.Rect(self.trap_position[0], self.trap_position[1], self.trap_width, self.trap_height)
-                if player_rect.colliderect(trap_rect):
-                    return True
+            if self.rect:
+                return player_rect.colliderect(self.rect)
             return False
         except Exception as e:
             print(f"Error checking collision: {e}")
@@ -66,11 +66,19 @@ class Trap:
         except Exception as e:
             print(f"Error updating trap: {e}")
 
+    def sprite(self):
+        """(image, world x, y) of the trap, or None if it hasn't been placed."""
+        if self.trap_position:
+            return self.trap_image, self.trap_position[0], self.trap_position[1]
+        return None
+
     def draw(self, screen, camera_x):
         """Draws the trap on the screen at its current position."""
         try:
-            if self.trap_position:
-                screen.blit(self.trap_image, (self.trap_position[0] - camera_x, self.trap_position[1]))
+            sprite = self.sprite()
+            if sprite:
+                image, x, y = sprite
+                screen.blit(image, (x - camera_x, y))
         except Exception as e:
             print(f"Error drawing trap: {e}")
 
@@ -93,6 +101,7 @@ class Head(Trap):
                 x_position = camera_x + WIDTH + random.randint(50, 200)
                 y_position = terrain_height - self.trap_height + 10
                 self.trap_position = (x_position, y_position)
+                self.rect = pygame.Rect(x_position, y_position, self.trap_width, self.trap_height)
         except Exception as e:
             print(f"Error spawning Head trap: {e}")
 
@@ -102,7 +111,7 @@ traps = [Spikes, Ball, Head]
 # Function to randomly generate a trap from the predefined list
 def generate_random_trap():
     try:
-        return random.choice(traps)()
+        return pools.acquire(random.choice(traps))  # Reuse a released trap of that type if there is one
     except Exception as e:
         print(f"Error generating random trap: {e}")
         return []
\ No newline at end of file
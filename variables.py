@@ -1,6 +1,7 @@
 # Variables used across the game so put them into one file for reducing redundancy
 
 WIDTH, HEIGHT, FPS = 900, 550, 60
+MAX_RENDER_FPS = 144  # The game logic always runs at FPS, drawing can go faster on high refresh rate screens
 BG_COLOR = (0, 0, 0)
 BIG_FONT_COLOR = (255, 255, 255)
 BIG_FONT_SIZE = 70
@@ -0,0 +1,79 @@
+from variables import WIDTH
+from objectPool import pools
+
+CHUNK_WIDTH = 512  # Width of a piece of the world in pixels
+LOOKAHEAD = 400  # How far past the right of the screen things spawn, so chunks there must already exist
+
+# A piece of the world and the traps and fruit spawned in it. The terrain is drawn by its scrolling layer, not the chunks
+class Chunk:
+    def __init__(self, release):
+        self.index = None  # Which piece of the world this is, None until it's first used
+        self.x = 0
+        self.traps = []
+        self.fruit_spawn = None  # (fruit, position) of the fruit spawned here, despawned with the chunk if it's still there
+        self.release = release  # Called with each trap the chunk drops
+
+    def reset(self, index):
+        """Reuse this chunk for another piece of the world, dropping whatever it held before."""
+        self.index = index
+        self.x = index * CHUNK_WIDTH
+        self.clear()
+
+    def clear(self):
+        """Give this chunk's traps back to their pools and despawn its fruit."""
+        for trap in self.traps:
+            self.release(trap)
+        self.traps.clear()
+        if self.fruit_spawn:
+            fruit, position = self.fruit_spawn
+            if fruit.fruit_position is position:  # Not collected or respawned somewhere else since
+                fruit.despawn()
+            self.fruit_spawn = None
+
+# Fixed ring of chunks around the camera. Chunks ahead are filled in as the camera reaches them and the
+# slots of chunks left behind are reused, so memory stays the same however far the player runs.
+class World:
+    def __init__(self, release=pools.release):
+        """release is called with every trap a chunk drops, to unregister it anywhere else and pool it."""
+        ring_size = -(-(WIDTH + LOOKAHEAD) // CHUNK_WIDTH) + 2  # Enough for the screen, the lookahead and one either side
+        self.chunks = [Chunk(release) for _ in range(ring_size)]
+        self.streamed = 0  # Number of times a chunk has been filled in, printed after a headless run
+        self.update(0)
+
+    def update(self, camera_x):
+        """Make sure every chunk from just behind the camera to past the right of the screen is loaded."""
+        first = max(0, camera_x // CHUNK_WIDTH)
+        last = (camera_x + WIDTH + LOOKAHEAD) // CHUNK_WIDTH
+        for index in range(first, last + 1):
+            self.get_chunk(index)
+
+    def get_chunk(self, index):
+        """Return the chunk for an index, recycling whichever chunk used its slot in the ring before."""
+        chunk = self.chunks[index % len(self.chunks)]
+        if chunk.index != index:
+            chunk.reset(index)
+            self.streamed += 1
+        return chunk
+
+    def loaded_chunks(self):
+        return sorted((chunk for chunk in self.chunks if chunk.index is not None), key=lambda chunk: chunk.index)
+
+    def clear(self):
+        """Give every trap back to its pool, e.g. when a new game starts."""
+        for chunk in self.chunks:
+            chunk.clear()
+
+    def add_trap(self, trap):
+        """Hand a placed trap to the chunk it's in."""
+        self.get_chunk(trap.trap_position[0] // CHUNK_WIDTH).traps.append(trap)
+
+    def add_fruit(self, fruit):
+        """Hand a freshly spawned fruit to the chunk it's in, which despawns it when the chunk is recycled."""
+        self.get_chunk(fruit.fruit_position[0] // CHUNK_WIDTH).fruit_spawn = (fruit, fruit.fruit_position)
+
+    def remove_trap(self, trap):
+        self.get_chunk(trap.trap_position[0] // CHUNK_WIDTH).traps.remove(trap)
+
+    def get_traps(self):
+        """Every trap in the loaded chunks, left to right. A new list, so traps can be removed while looping."""
+        return [trap for chunk in self.loaded_chunks() for trap in chunk.traps]